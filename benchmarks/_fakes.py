@@ -0,0 +1,426 @@
+"""Minimal stand-ins for Home Assistant and MQTT used by the benchmarks.
+
+Only the names the integration imports at module level are provided, so
+helpers, text processing and the integration setup can be imported and
+driven without Home Assistant or a broker. The entity platforms are not
+covered, and the voluptuous stand-in validates nothing. When Home
+Assistant is installed it is used for imports, but publishing always goes
+through FakeMqtt.
+"""
+import asyncio
+import datetime
+import enum
+import importlib.util
+import sys
+import types
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class FakeConfigEntryState(enum.Enum):
+    """Config entry states the integration checks."""
+
+    LOADED = "loaded"
+    NOT_LOADED = "not_loaded"
+
+
+class FakeConfigEntry:
+    """Config entry carrying only the attributes the integration reads.
+
+    Like the real one it is generic in its runtime data; the benchmarks set
+    that with runtime_data() or async_setup_entry.
+    """
+
+    def __class_getitem__(cls, item: Any) -> type:
+        return cls
+
+    def __init__(
+        self,
+        num_modules: int,
+        num_rows: int,
+        options: Optional[Dict[str, Any]] = None,
+        entry_id: str = "bench",
+    ) -> None:
+        self.entry_id = entry_id
+        self.title = f"bench {num_rows}x{num_modules}"
+        self.data = {
+            "mqtt_topic": f"splitflap/{entry_id}",
+            "command_topic": f"splitflap/{entry_id}/command",
+            "num_modules": num_modules,
+            "num_rows": num_rows,
+        }
+        self.options = dict(options or {})
+        self.state = FakeConfigEntryState.LOADED
+        self.runtime_data: Any = None
+        self.on_unload: List[Callable[[], Any]] = []
+
+    def async_on_unload(self, func: Callable[[], Any]) -> None:
+        """Remember a callback to run when the entry unloads."""
+        self.on_unload.append(func)
+
+    def add_update_listener(self, listener: Callable) -> Callable[[], None]:
+        """Accept an options listener; options never change in the benchmarks."""
+        return lambda: None
+
+
+class FakeServices:
+    """Service registry that runs handlers in tasks, like a non-blocking call."""
+
+    def __init__(self, hass: "FakeHass") -> None:
+        self._hass = hass
+        self._handlers: Dict[Tuple[str, str], Callable] = {}
+
+    def async_register(self, domain: str, service: str, handler: Callable, schema: Any = None) -> None:
+        """Register a coroutine handler taking the service data."""
+        self._handlers[(domain, service)] = handler
+
+    async def async_call(self, domain: str, service: str, service_data: Dict[str, Any], blocking: bool = False) -> None:
+        """Copy the service data and run the handler."""
+        await self._handlers[(domain, service)](dict(service_data))
+
+
+class FakeConfigEntries:
+    """Config entry manager that does not load any platform."""
+
+    def __init__(self) -> None:
+        self.entries: List[FakeConfigEntry] = []
+
+    def async_entries(self, domain: Optional[str] = None) -> List[FakeConfigEntry]:
+        """Return the entries added to entries."""
+        return list(self.entries)
+
+    async def async_forward_entry_setups(self, entry: Any, platforms: Any) -> None:
+        """Skip platform setup."""
+
+    async def async_unload_platforms(self, entry: Any, platforms: Any) -> bool:
+        """Skip platform unloading."""
+        return True
+
+
+class FakeEntityRegistry:
+    """Entity registry resolving unique ids to entity ids."""
+
+    def __init__(self) -> None:
+        self.entities: Dict[Tuple[str, str, str], str] = {}
+
+    def async_get_entity_id(self, domain: str, platform: str, unique_id: str) -> Optional[str]:
+        """Return the entity id registered for a unique id."""
+        return self.entities.get((getattr(domain, "value", domain), platform, unique_id))
+
+
+class FakeHass:
+    """Home Assistant object exposing the data registry, loop and services."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.data: Dict[str, Any] = {}
+        self.loop = loop
+        self.services = FakeServices(self)
+        self.config_entries = FakeConfigEntries()
+        self.entity_registry = FakeEntityRegistry()
+
+    def async_create_task(self, coro) -> asyncio.Task:
+        """Schedule a coroutine on the loop."""
+        return self.loop.create_task(coro)
+
+    def async_create_background_task(self, coro, name: str) -> asyncio.Task:
+        """Schedule a long running coroutine on the loop."""
+        return self.loop.create_task(coro, name=name)
+
+    def async_add_executor_job(self, target: Callable, *args: Any) -> asyncio.Future:
+        """Run target in the loop's default executor."""
+        return self.loop.run_in_executor(None, target, *args)
+
+
+class FakeStore:
+    """In-memory Store shared by key, like files on disk.
+
+    Delayed saves are kept until async_load or a save.
+    """
+
+    saved: Dict[str, Any] = {}
+
+    def __init__(self, hass: Any, version: int, key: str) -> None:
+        self.key = key
+        self._data_func: Optional[Callable[[], Any]] = None
+
+    @property
+    def data(self) -> Any:
+        """Return the last saved data."""
+        return self.saved.get(self.key)
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+        """Remember the data function instead of scheduling a write."""
+        self._data_func = data_func
+
+    async def async_save(self, data: Any) -> None:
+        """Keep data."""
+        self._data_func = None
+        self.saved[self.key] = data
+
+    async def async_load(self) -> Any:
+        """Return the saved data, writing a pending delayed save first."""
+        if self._data_func is not None:
+            await self.async_save(self._data_func())
+        return self.data
+
+    async def async_remove(self) -> None:
+        """Forget the data."""
+        self._data_func = None
+        self.saved.pop(self.key, None)
+
+
+class FakeMqtt:
+    """Records publishes instead of sending them to a broker."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.published: List[Tuple[str, str]] = []
+        self.bytes_published = 0
+        self.subscriptions: Dict[str, Callable] = {}
+        self.retained: Dict[str, str] = {}
+        # Called with each publish's topic and payload, like a device on the broker.
+        self.responders: List[Callable[[str, str], None]] = []
+
+    async def async_publish(self, hass, topic: str, payload: str, qos: int = 0, retain: bool = False) -> None:
+        """Record a publish, optionally waiting a simulated broker round trip."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.published.append((topic, payload))
+        self.bytes_published += len(payload)
+        if retain:
+            self.retained[topic] = payload
+        for responder in self.responders:
+            responder(topic, payload)
+
+    def deliver(self, topic: str, payload: str) -> None:
+        """Send a message to the subscriber of topic, if there is one."""
+        if topic in self.subscriptions:
+            self.subscriptions[topic](FakeReceiveMessage(topic, payload))
+
+    async def async_subscribe(self, hass, topic: str, msg_callback, qos: int = 0):
+        """Record a subscription's callback, deliver any retained message and return an unsubscribe."""
+        self.subscriptions[topic] = msg_callback
+        if topic in self.retained:
+            hass.loop.call_soon(msg_callback, FakeReceiveMessage(topic, self.retained[topic], retain=True))
+        return lambda: self.subscriptions.pop(topic, None)
+
+
+class FakeReceiveMessage:
+    """Inbound MQTT message."""
+
+    def __init__(self, topic: str, payload: str, retain: bool = False) -> None:
+        self.topic = topic
+        self.payload = payload
+        self.retain = retain
+
+
+class FakeFirmware:
+    """Display that reports "settled" on its state topic once its flaps stop.
+
+    Every module turns one flap per step_time, forward only, so a frame
+    settles after the longest travel of any module. A frame replaced before
+    it settles is never reported. Settle times are recorded in event loop
+    time.
+    """
+
+    def __init__(
+        self,
+        broker: FakeMqtt,
+        display_topic: str,
+        state_topic: str,
+        flap_order: str,
+        step_time: float,
+    ) -> None:
+        """Attach the display to broker."""
+        self._broker = broker
+        self._display_topic = display_topic
+        self._state_topic = state_topic
+        self._positions = {flap: index for index, flap in enumerate(flap_order)}
+        self._step_time = step_time
+        self._frame: Optional[str] = None
+        self._report: Optional[asyncio.TimerHandle] = None
+        self.settled_at: List[float] = []
+        broker.responders.append(self._frame_published)
+
+    def _travel(self, frame: str) -> int:
+        if self._frame is None or len(self._frame) != len(frame):
+            return len(self._positions) - 1
+        flaps = len(self._positions)
+        return max(
+            ((self._positions.get(new, 0) - self._positions.get(old, 0)) % flaps
+             for old, new in zip(self._frame, frame)),
+            default=0,
+        )
+
+    def _frame_published(self, topic: str, payload: str) -> None:
+        if topic != self._display_topic:
+            return
+        if self._report is not None:
+            self._report.cancel()
+        travel = self._travel(payload)
+        self._frame = payload
+        self._report = asyncio.get_running_loop().call_later(
+            travel * self._step_time, self._settled
+        )
+
+    def _settled(self) -> None:
+        self._report = None
+        self.settled_at.append(asyncio.get_running_loop().time())
+        self._broker.deliver(self._state_topic, "settled")
+
+
+def _async_call_later(hass: FakeHass, delay: float, action: Callable) -> Callable[[], None]:
+    def run() -> None:
+        if asyncio.iscoroutinefunction(action):
+            hass.async_create_task(action(None))
+        else:
+            action(None)
+
+    handle = hass.loop.call_later(delay, run)
+    return handle.cancel
+
+
+def _module(name: str, **attrs: Any) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+def _install_voluptuous() -> None:
+    """Register a voluptuous whose schemas return the data they are given."""
+
+    def marker(key: Any, **kwargs: Any) -> Any:
+        return key
+
+    def validator(*args: Any, **kwargs: Any) -> Callable[[Any], Any]:
+        return lambda value: value
+
+    _module(
+        "voluptuous",
+        Schema=validator,
+        Required=marker,
+        Optional=marker,
+        All=validator,
+        Coerce=validator,
+        Range=validator,
+        In=validator,
+        Any=validator,
+        Length=validator,
+        Invalid=ValueError,
+    )
+
+
+def install() -> None:
+    """Register stub Home Assistant modules unless the real package is present."""
+    if not ("voluptuous" in sys.modules or importlib.util.find_spec("voluptuous")):
+        _install_voluptuous()
+    if "homeassistant" in sys.modules or importlib.util.find_spec("homeassistant"):
+        return
+
+    class Entity:
+        pass
+
+    class TextEntity(Entity):
+        """Refuses a state longer than native_max, as Home Assistant's does."""
+
+        native_max = 255
+
+        @property
+        def state(self) -> Optional[str]:
+            value = self.native_value
+            if value is not None and len(value) > self.native_max:
+                raise ValueError(f"Entity state is longer than {self.native_max} characters")
+            return value
+
+        def async_write_ha_state(self) -> None:
+            self.state
+
+    class RestoreEntity:
+        async def async_get_last_state(self) -> Any:
+            return None
+
+        async def async_get_last_extra_data(self) -> Any:
+            return None
+
+    class RestoredExtraData:
+        def __init__(self, json_dict: Dict[str, Any]) -> None:
+            self.json_dict = json_dict
+
+        def as_dict(self) -> Dict[str, Any]:
+            return self.json_dict
+
+    class Platform(str, enum.Enum):
+        TEXT = "text"
+        SELECT = "select"
+        NUMBER = "number"
+        SWITCH = "switch"
+        SENSOR = "sensor"
+
+    broker = FakeMqtt()
+    _module("homeassistant")
+    mqtt = _module(
+        "homeassistant.components.mqtt",
+        async_publish=broker.async_publish,
+        async_subscribe=broker.async_subscribe,
+    )
+    mqtt.models = _module("homeassistant.components.mqtt.models", ReceiveMessage=FakeReceiveMessage)
+    _module("homeassistant.components", mqtt=mqtt)
+    _module(
+        "homeassistant.config_entries",
+        ConfigEntry=FakeConfigEntry,
+        ConfigEntryState=FakeConfigEntryState,
+    )
+    _module(
+        "homeassistant.const",
+        Platform=Platform,
+        STATE_UNAVAILABLE="unavailable",
+        STATE_UNKNOWN="unknown",
+    )
+    _module(
+        "homeassistant.core",
+        CALLBACK_TYPE=Callable[[], None],
+        Event=Any,
+        HomeAssistant=FakeHass,
+        ServiceCall=Any,
+        ServiceResponse=Any,
+        SupportsResponse=enum.Enum("SupportsResponse", "NONE OPTIONAL ONLY"),
+        callback=lambda func: func,
+    )
+    _module("homeassistant.components.text", TextEntity=TextEntity)
+    _module("homeassistant.exceptions", HomeAssistantError=Exception, TemplateError=ValueError)
+    helpers = _module("homeassistant.helpers")
+    helpers.config_validation = _module(
+        "homeassistant.helpers.config_validation",
+        string=str,
+        boolean=bool,
+        ensure_list=lambda value: value,
+        has_at_least_one_key=lambda *keys: lambda value: value,
+        make_entity_service_schema=lambda schema: lambda value: value,
+        config_entry_only_config_schema=lambda domain: None,
+    )
+    helpers.entity_platform = _module(
+        "homeassistant.helpers.entity_platform",
+        AddEntitiesCallback=Callable,
+        async_get_current_platform=lambda: None,
+    )
+    _module("homeassistant.helpers.entity", DeviceInfo=dict, Entity=Entity)
+    helpers.storage = _module("homeassistant.helpers.storage", Store=FakeStore)
+    helpers.restore_state = _module(
+        "homeassistant.helpers.restore_state",
+        RestoreEntity=RestoreEntity,
+        RestoredExtraData=RestoredExtraData,
+    )
+    util = _module("homeassistant.util")
+    util.dt = _module(
+        "homeassistant.util.dt", utcnow=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+    _module("homeassistant.helpers.entity_registry", async_get=lambda hass: hass.entity_registry)
+    _module(
+        "homeassistant.helpers.event",
+        async_call_later=_async_call_later,
+        async_track_template_result=None,
+        TrackTemplate=None,
+        TrackTemplateResult=Any,
+        TrackTemplateResultInfo=Any,
+    )
+    helpers.template = _module("homeassistant.helpers.template", Template=str)
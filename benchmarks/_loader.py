@@ -0,0 +1,17 @@
+"""Import the integration's modules without running its Home Assistant setup."""
+import importlib
+import sys
+import types
+from pathlib import Path
+
+PACKAGE = "custom_components"
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / PACKAGE
+
+
+def load(module: str) -> types.ModuleType:
+    """Import a submodule of the integration, skipping the package __init__."""
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(PACKAGE_DIR)]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
@@ -0,0 +1,61 @@
+"""Check fit_to_rows against the golden layout corpus.
+
+Run ``python benchmarks/check_golden.py`` to verify the current layout code
+produces byte-identical rows, or pass ``--update`` to regenerate the corpus
+after an intentional layout change. A case may give the flap alphabet of
+the display it is laid out for.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from _loader import load
+
+CORPUS = Path(__file__).resolve().parent / "golden_layout.json"
+
+
+def _row_to_list(row) -> list:
+    return [
+        row.content,
+        row.is_continuation,
+        row.splits_word,
+        row.has_triple_spaces,
+        row.word_length,
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="rewrite the corpus from the current code")
+    args = parser.parse_args()
+
+    text_processing = load("text_processing")
+    cases = json.loads(CORPUS.read_text(encoding="utf-8"))
+
+    failures = 0
+    for case in cases:
+        rows = text_processing.fit_to_rows(
+            case["text"], case["row_length"], case["mode"], case.get("alphabet", "")
+        )
+        actual = [_row_to_list(row) for row in rows]
+        if args.update:
+            case["rows"] = actual
+        elif actual != case["rows"]:
+            failures += 1
+            print(
+                f"MISMATCH mode={case['mode']!r} row_length={case['row_length']} "
+                f"alphabet={case.get('alphabet', '')!r} text={case['text']!r}"
+            )
+
+    if args.update:
+        CORPUS.write_text(json.dumps(cases, ensure_ascii=False), encoding="utf-8")
+        print(f"Updated {len(cases)} cases in {CORPUS.name}")
+        return 0
+
+    print(f"{len(cases) - failures}/{len(cases)} golden layout cases match")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,610 @@
+"""Benchmark the Splitflap layout and publish pipeline.
+
+Runs without Home Assistant or an MQTT broker: Home Assistant imports are
+stubbed by _fakes when the package is not installed, and publishing always
+goes to an in-memory FakeMqtt. Results are written as JSON so runs can be
+compared with ``--compare``::
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+import _fakes
+from _loader import load
+
+MESSAGE_SIZES = [10, 100, 1_000, 10_000, 100_000]
+GEOMETRIES = [(1, 10), (2, 20), (4, 40), (10, 100)]
+PUBLISH_PAGE_COUNTS = [1, 10, 100, 1_000]
+SCHEDULE_DISPLAY_COUNTS = [1, 10, 50]
+SCHEDULE_PAGES = 20
+SCHEDULE_DELAY = 0.01
+SCHEDULE_BROKER_LATENCY = 0.002
+DISPATCH_MESSAGES = 2_000
+RERENDER_SIZES = [100, 1_000]
+RERENDER_OVERFLOW_TYPES = ["new line", "none"]
+LOOP_BLOCK_SIZES = [2_000, 20_000, 200_000]
+LOOP_BLOCK_OVERFLOW_TYPES = ["new line", "optimal"]
+LOOP_BLOCK_HEARTBEAT = 0.001
+SETTLE_PAGES = 20
+SETTLE_READING = 0.02
+SETTLE_STEP_TIME = 0.002
+# The configured flap step time, slower than the firmware's to be safe.
+SETTLE_ESTIMATED_STEP_TIME = 0.003
+
+_WORDS = (
+    "the next train to central departs from platform four at eight fifteen "
+    "door open garage temperature outside humidity weather forecast rain "
+    "supercalifragilisticexpialidocious \\rred \\ggreen alert"
+).split()
+
+
+def make_message(size: int, seed: int = 0) -> str:
+    """Build a deterministic message of exactly size characters."""
+    rng = random.Random(seed + size)
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(_WORDS)
+        spacing = "   " if rng.random() < 0.05 else " "
+        parts.append(word + spacing)
+        length += len(word) + len(spacing)
+    return "".join(parts)[:size]
+
+
+def measure(func: Callable[[], Any], min_time: float, repeats: int) -> Dict[str, float]:
+    """Time func, looping until each sample lasts at least min_time seconds."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    samples = [elapsed / loops]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    return {
+        "loops": loops,
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+    }
+
+
+def bench_layout(helpers, text_processing, const, min_time: float, repeats: int) -> List[Dict[str, Any]]:
+    """Time fit_to_rows and create_pages across sizes, overflow modes and geometries.
+
+    Scrolling messages are not fitted to rows, so scroll is left out.
+    """
+    results = []
+    modes = [mode for mode in const.OVERFLOW_TYPES if mode != const.OVERFLOW_SCROLL]
+    for num_rows, num_modules in GEOMETRIES:
+        entry = _fakes.FakeConfigEntry(num_modules, num_rows)
+        for mode in modes:
+            for size in MESSAGE_SIZES:
+                text = make_message(size)
+                rows = text_processing.fit_to_rows(text, num_modules, mode)
+                pages = helpers.create_pages(rows, entry, True)
+                fit = measure(lambda: text_processing.fit_to_rows(text, num_modules, mode), min_time, repeats)
+                create = measure(lambda: helpers.create_pages(rows, entry, True), min_time, repeats)
+                results.append(
+                    {
+                        "geometry": f"{num_rows}x{num_modules}",
+                        "overflow_type": mode,
+                        "size": size,
+                        "rows": len(rows),
+                        "pages": len(pages),
+                        "fit_to_rows": fit,
+                        "create_pages": create,
+                        "total_median_s": fit["median_s"] + create["median_s"],
+                    }
+                )
+                print(
+                    f"layout {num_rows}x{num_modules:<4} {mode:<9} {size:>7} chars: "
+                    f"{(fit['median_s'] + create['median_s']) * 1e3:9.3f} ms ({len(pages)} pages)",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    """Return the peak traced allocation in bytes while running func."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_streaming(helpers, text_processing, min_time: float, repeats: int) -> List[Dict[str, Any]]:
+    """Compare eager and lazy layout: time to the first page and peak memory for all pages."""
+    results = []
+    num_rows, num_modules = 2, 20
+    entry = _fakes.FakeConfigEntry(num_modules, num_rows)
+    for size in MESSAGE_SIZES:
+        text = make_message(size)
+
+        def eager_pages():
+            return helpers.create_pages(text_processing.fit_to_rows(text, num_modules, "new line"), entry, False)
+
+        def lazy_pages():
+            return helpers.LazyPages(text, num_modules, num_rows, "new line", False, "")
+
+        def drain(pages) -> None:
+            for _ in pages:
+                pass
+
+        eager = {
+            "first_page": measure(lambda: eager_pages()[0], min_time, repeats),
+            "peak_bytes": _peak_memory(lambda: drain(eager_pages())),
+        }
+        lazy = {
+            "first_page": measure(lambda: next(iter(lazy_pages())), min_time, repeats),
+            "peak_bytes": _peak_memory(lambda: drain(lazy_pages())),
+        }
+        results.append({"size": size, "eager": eager, "lazy": lazy})
+        print(
+            f"streaming {size:>7} chars: first page {eager['first_page']['median_s'] * 1e3:8.3f} ms eager, "
+            f"{lazy['first_page']['median_s'] * 1e3:8.3f} ms lazy; peak "
+            f"{eager['peak_bytes'] / 1024:8.1f} KiB eager, {lazy['peak_bytes'] / 1024:8.1f} KiB lazy",
+            file=sys.stderr,
+        )
+    return results
+
+
+def bench_rerender(text_processing, min_time: float, repeats: int) -> List[Dict[str, Any]]:
+    """Compare fitting a template render from scratch with RowLayout when one value changes."""
+    results = []
+    num_modules = 20
+    for overflow_type in RERENDER_OVERFLOW_TYPES:
+        for size in RERENDER_SIZES:
+            text = make_message(size)
+            middle = len(text) // 2
+            renders = [f"{text[:middle]} 14:{minute:02d} {text[middle:]}" for minute in range(2)]
+            layout = text_processing.RowLayout(num_modules, overflow_type)
+            turn = [0]
+
+            def full():
+                turn[0] ^= 1
+                return text_processing.fit_to_rows(renders[turn[0]], num_modules, overflow_type)
+
+            def incremental():
+                turn[0] ^= 1
+                return layout.update(renders[turn[0]])
+
+            layout.update(renders[1])
+            full_time = measure(full, min_time, repeats)
+            incremental_time = measure(incremental, min_time, repeats)
+            results.append(
+                {
+                    "overflow_type": overflow_type,
+                    "size": size,
+                    "full": full_time,
+                    "incremental": incremental_time,
+                    "rows_fitted": layout.rows_fitted,
+                    "rows": len(layout.rows),
+                }
+            )
+            print(
+                f"rerender {overflow_type:<9} {size:>6} chars: {full_time['median_s'] * 1e3:8.3f} ms full, "
+                f"{incremental_time['median_s'] * 1e3:8.3f} ms incremental "
+                f"({layout.rows_fitted} of {len(layout.rows)} rows fitted)",
+                file=sys.stderr,
+            )
+    return results
+
+
+def bench_publish(helpers, const, min_time: float, repeats: int) -> List[Dict[str, Any]]:
+    """Time a page playback with zero delay against the fake broker."""
+    results = []
+    num_rows, num_modules = 2, 20
+    entry = _fakes.FakeConfigEntry(num_modules, num_rows)
+    loop = asyncio.new_event_loop()
+    hass = _fakes.FakeHass(loop)
+    _set_runtime_data(hass, entry)
+    broker = _fakes.FakeMqtt()
+    helpers.mqtt = broker
+    try:
+        for page_count in PUBLISH_PAGE_COUNTS:
+            pages = [f"{i:0{num_modules * num_rows}d}" for i in range(page_count)]
+
+            def run_loop() -> None:
+                loop.run_until_complete(_play(helpers, hass, entry, pages, 0))
+
+            timing = measure(run_loop, min_time, repeats)
+            results.append(
+                {
+                    "pages": page_count,
+                    "loop": timing,
+                    "per_page_median_s": timing["median_s"] / page_count,
+                }
+            )
+            print(
+                f"publish {page_count:>5} pages: {timing['median_s'] / page_count * 1e6:8.2f} us/page",
+                file=sys.stderr,
+            )
+    finally:
+        loop.close()
+    return results
+
+
+def _set_runtime_data(hass, entry) -> Any:
+    """Give entry the runtime data publishing needs, as async_setup_entry would."""
+    runtime = load("runtime")
+    entry.runtime_data = runtime.SplitflapData(
+        settings=runtime.DisplaySettings.from_entry(entry),
+        stats=load("stats").DisplayStats(hass),
+        layout_cache=load("layout_cache").LayoutCache(0),
+    )
+    return entry.runtime_data
+
+
+async def _play(helpers, hass, entry, pages: List[str], delay: float) -> None:
+    """Show pages on a display and wait until the last page's dwell ends."""
+    done = asyncio.get_running_loop().create_future()
+    helpers.display_pages(hass, entry, pages, delay, 0, 0, on_done=done.set_result)
+    await done
+
+
+def bench_schedule(helpers, const, scheduler_module) -> List[Dict[str, Any]]:
+    """Show paced messages on many displays at once and report scheduler lateness.
+
+    Every display shares the one scheduler. Overrun is how much longer than
+    the ideal pages * delay the slowest display took; publishes wait a
+    simulated broker round trip.
+    """
+    results = []
+    pages = [f"{i:040d}" for i in range(SCHEDULE_PAGES)]
+    for display_count in SCHEDULE_DISPLAY_COUNTS:
+        loop = asyncio.new_event_loop()
+        hass = _fakes.FakeHass(loop)
+        helpers.mqtt = _fakes.FakeMqtt(latency=SCHEDULE_BROKER_LATENCY)
+        entries = [
+            _fakes.FakeConfigEntry(20, 2, entry_id=f"bench{i}") for i in range(display_count)
+        ]
+        for entry in entries:
+            _set_runtime_data(hass, entry)
+
+        async def run_all() -> float:
+            start = loop.time()
+            await asyncio.gather(
+                *(_play(helpers, hass, entry, pages, SCHEDULE_DELAY) for entry in entries)
+            )
+            return loop.time() - start
+
+        try:
+            elapsed = loop.run_until_complete(run_all())
+        finally:
+            loop.close()
+        stats = scheduler_module.get_scheduler(hass).stats()
+        overrun = elapsed - SCHEDULE_PAGES * SCHEDULE_DELAY
+        results.append(
+            {
+                "displays": display_count,
+                "overrun_s": overrun,
+                "mean_lateness_s": stats["mean_lateness"],
+                "max_lateness_s": stats["max_lateness"],
+            }
+        )
+        print(
+            f"schedule {display_count:>4} displays: overrun {overrun * 1e3:7.2f} ms, "
+            f"lateness mean {stats['mean_lateness'] * 1e3:6.3f} ms max {stats['max_lateness'] * 1e3:6.3f} ms",
+            file=sys.stderr,
+        )
+    return results
+
+
+def bench_settle(helpers, const, settle) -> List[Dict[str, Any]]:
+    """Show pages on a fake display that reports settling, under each pacing.
+
+    The fake firmware turns its flaps every SETTLE_STEP_TIME. Fixed pacing
+    needs a delay covering a full revolution on top of reading time, flap
+    travel pacing estimates settling from the configured, slower, step time,
+    and the state topic advances on the display's own report. Reading is the
+    shortest time a settled page stayed up; it must not fall below
+    SETTLE_READING.
+    """
+    results = []
+    order = const.DEFAULT_FLAP_ORDER
+    # A clock, so most pages move a flap or two and some most of a revolution.
+    pages = [f"{'TIME':<20}{f'12:{minute:02d}':<20}" for minute in range(SETTLE_PAGES)]
+    worst_settle = (len(order) - 1) * SETTLE_STEP_TIME
+    cases = [
+        ("fixed", {const.CONF_PACING: "fixed"}, False, SETTLE_READING + worst_settle),
+        (
+            "flap travel",
+            {const.CONF_PACING: const.PACING_FLAP_TRAVEL, const.CONF_FLAP_STEP_TIME: SETTLE_ESTIMATED_STEP_TIME},
+            False,
+            SETTLE_READING,
+        ),
+        (
+            "state topic",
+            {const.CONF_PACING: const.PACING_FLAP_TRAVEL, const.CONF_FLAP_STEP_TIME: SETTLE_ESTIMATED_STEP_TIME},
+            True,
+            SETTLE_READING,
+        ),
+    ]
+    for name, options, acknowledged, delay in cases:
+        loop = asyncio.new_event_loop()
+        hass = _fakes.FakeHass(loop)
+        broker = _fakes.FakeMqtt()
+        helpers.mqtt = settle.mqtt = broker
+        entry = _fakes.FakeConfigEntry(20, 2, options=options)
+        entry.data[const.CONF_STATE_TOPIC] = f"{entry.data[const.CONF_MQTT_TOPIC]}/state"
+        firmware = _fakes.FakeFirmware(
+            broker, entry.data[const.CONF_MQTT_TOPIC], entry.data[const.CONF_STATE_TOPIC], order, SETTLE_STEP_TIME
+        )
+        published_at: List[float] = []
+        broker.responders.append(lambda topic, payload: published_at.append(loop.time()))
+        data = _set_runtime_data(hass, entry)
+
+        async def run() -> float:
+            if acknowledged:
+                data.settle_tracker = settle.SettleTracker(hass, entry.title)
+                await data.settle_tracker.async_start(entry.data[const.CONF_STATE_TOPIC])
+            start = loop.time()
+            await _play(helpers, hass, entry, pages, delay)
+            return loop.time() - start
+
+        try:
+            elapsed = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        readings = [
+            min((at for at in published_at if at >= settled), default=settled + delay) - settled
+            for settled in firmware.settled_at[:-1]
+        ]
+        result = {
+            "pacing": name,
+            "elapsed_s": elapsed,
+            "pages_per_s": SETTLE_PAGES / elapsed,
+            "settled": len(firmware.settled_at),
+            "min_reading_s": min(readings, default=None),
+        }
+        results.append(result)
+        print(
+            f"settle {name:<12}: {result['pages_per_s']:7.2f} pages/s, "
+            f"{result['settled']} of {SETTLE_PAGES} settled, "
+            f"min reading {(result['min_reading_s'] or 0) * 1e3:6.2f} ms",
+            file=sys.stderr,
+        )
+    return results
+
+
+class _RecordingTextEntity:
+    """Text entity stand-in that only records what it is asked to show."""
+
+    def __init__(self) -> None:
+        self.shown = 0
+
+    def async_handle_command(self, payload: Dict[str, Any]) -> None:
+        self.shown += 1
+
+    async def async_display_text(self, text: str, **kwargs: Any) -> None:
+        self.shown += 1
+
+
+def bench_loop_block(helpers, repeats: int) -> List[Dict[str, Any]]:
+    """Report the longest event loop stall while a long message is laid out.
+
+    The "inline" path lays the message out on the event loop with
+    layout_pages; the "async" path uses async_layout_pages. Both take the
+    first page, which is when lazy pages do their first layout work.
+    """
+    loop = asyncio.new_event_loop()
+    hass = _fakes.FakeHass(loop)
+    entry = _fakes.FakeConfigEntry(20, 4)
+    settings = _set_runtime_data(hass, entry).settings
+
+    async def longest_stall(layout: Callable[[], Awaitable[Iterable[str]]]) -> float:
+        stall = 0.0
+        done = False
+
+        async def heartbeat() -> None:
+            nonlocal stall
+            last = time.perf_counter()
+            while not done:
+                await asyncio.sleep(LOOP_BLOCK_HEARTBEAT)
+                now = time.perf_counter()
+                stall = max(stall, now - last - LOOP_BLOCK_HEARTBEAT)
+                last = now
+
+        task = loop.create_task(heartbeat())
+        await asyncio.sleep(LOOP_BLOCK_HEARTBEAT * 2)
+        next(iter(await layout()), None)
+        done = True
+        await task
+        return stall
+
+    results = []
+    try:
+        for overflow_type in LOOP_BLOCK_OVERFLOW_TYPES:
+            for size in LOOP_BLOCK_SIZES:
+                # Words longer than a row end a paragraph of optimal fitting, so
+                # they are left out to lay the message out as one paragraph.
+                words = (word for word in make_message(size * 2).split() if len(word) <= 20)
+                text = " ".join(words)[:size]
+
+                async def inline() -> Iterable[str]:
+                    return helpers.layout_pages(text, settings, overflow_type, False)
+
+                def in_executor() -> Awaitable[Iterable[str]]:
+                    return helpers.async_layout_pages(hass, text, settings, overflow_type, False)
+
+                case: Dict[str, Any] = {"overflow_type": overflow_type, "size": size}
+                for path, layout in (("inline", inline), ("async", in_executor)):
+                    stalls = [loop.run_until_complete(longest_stall(layout)) for _ in range(repeats)]
+                    case[path] = {"median_stall_s": statistics.median(stalls)}
+                print(
+                    f"loop block {overflow_type:<8} {size:>7}: "
+                    f"inline {case['inline']['median_stall_s'] * 1000:7.2f} ms  "
+                    f"async {case['async']['median_stall_s'] * 1000:7.2f} ms",
+                    file=sys.stderr,
+                )
+                results.append(case)
+    finally:
+        loop.close()
+    return results
+
+
+def bench_dispatch(integration, const, repeats: int) -> Dict[str, Any]:
+    """Time command topic messages from the MQTT callback until the entity has them.
+
+    The "service" path is the registry lookup and service call used before
+    the text entity registered itself; the "direct" path calls the entity.
+    The fake service layer skips Home Assistant's schema validation and
+    context handling, so the real service path is slower than measured here.
+    """
+    loop = asyncio.new_event_loop()
+    hass = _fakes.FakeHass(loop)
+    entry = _fakes.FakeConfigEntry(20, 2, options={const.CONF_COMMAND_RATE_LIMIT: 0})
+    broker = _fakes.FakeMqtt()
+    integration.mqtt = broker
+    entity = _RecordingTextEntity()
+    entity_id = "text.bench_text"
+    hass.entity_registry.entities[("text", const.DOMAIN, f"{const.DOMAIN}_{entry.entry_id}_text")] = entity_id
+
+    async def display_text(service_data: Dict[str, Any]) -> None:
+        service_data.pop("entity_id")
+        await entity.async_display_text(**service_data)
+
+    hass.services.async_register(const.DOMAIN, const.SERVICE_DISPLAY_TEXT, display_text)
+
+    results: Dict[str, Any] = {"messages": DISPATCH_MESSAGES}
+    try:
+        loop.run_until_complete(integration.async_setup_entry(hass, entry))
+        data = entry.runtime_data
+        listener = broker.subscriptions[entry.data[const.CONF_COMMAND_TOPIC]]
+        message = _fakes.FakeReceiveMessage(
+            entry.data[const.CONF_COMMAND_TOPIC], json.dumps({"text": "DOOR OPEN", "center_text": True})
+        )
+
+        async def deliver() -> None:
+            for _ in range(DISPATCH_MESSAGES):
+                listener(message)
+            for _ in range(DISPATCH_MESSAGES * 10):
+                if entity.shown >= DISPATCH_MESSAGES:
+                    return
+                await asyncio.sleep(0)
+            raise RuntimeError(f"only {entity.shown} of {DISPATCH_MESSAGES} messages were dispatched")
+
+        for path, registered in (("service", None), ("direct", entity)):
+            data.text_entity = registered
+            samples = []
+            for _ in range(repeats):
+                entity.shown = 0
+                start = time.perf_counter()
+                loop.run_until_complete(deliver())
+                samples.append((time.perf_counter() - start) / DISPATCH_MESSAGES)
+            results[path] = {"min_s": min(samples), "median_s": statistics.median(samples)}
+            print(f"dispatch {path:<8}: {statistics.median(samples) * 1e6:8.2f} us/message", file=sys.stderr)
+    finally:
+        for func in entry.on_unload:
+            func()
+        loop.close()
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print the speedup of every layout, re-render and publish case against a baseline run."""
+    def index(results: Dict[str, Any]) -> Dict[tuple, float]:
+        cases = {}
+        for case in results.get("layout", []):
+            cases[("layout", case["geometry"], case["overflow_type"], case["size"])] = case["total_median_s"]
+        for case in results.get("rerender", []):
+            cases[("rerender", case["overflow_type"], case["size"])] = case["incremental"]["median_s"]
+        for case in results.get("publish", []):
+            cases[("publish", case["pages"])] = case["per_page_median_s"]
+        for case in results.get("loop_block", []):
+            cases[("loop_block", case["overflow_type"], case["size"])] = case["async"]["median_stall_s"]
+        for case in results.get("settle", []):
+            cases[("settle", case["pacing"])] = case["elapsed_s"]
+        for path in ("service", "direct"):
+            if path in results.get("dispatch", {}):
+                cases[("dispatch", path)] = results["dispatch"][path]["median_s"]
+        return cases
+
+    before = index(baseline)
+    for key, after in index(current).items():
+        if key in before and after > 0:
+            print(f"{' '.join(map(str, key)):<45} {before[key] / after:6.2f}x")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="print speedups against a previous JSON result file")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per timing sample")
+    parser.add_argument("--repeats", type=int, default=5, help="timing samples per case")
+    parser.add_argument("--skip-layout", action="store_true")
+    parser.add_argument("--skip-streaming", action="store_true")
+    parser.add_argument("--skip-rerender", action="store_true")
+    parser.add_argument("--skip-publish", action="store_true")
+    parser.add_argument("--skip-schedule", action="store_true")
+    parser.add_argument("--skip-settle", action="store_true")
+    parser.add_argument("--skip-loop-block", action="store_true")
+    parser.add_argument("--skip-dispatch", action="store_true")
+    args = parser.parse_args()
+
+    _fakes.install()
+    const = load("const")
+    text_processing = load("text_processing")
+    helpers = load("helpers")
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "min_time_s": args.min_time,
+            "repeats": args.repeats,
+        }
+    }
+    if not args.skip_layout:
+        results["layout"] = bench_layout(helpers, text_processing, const, args.min_time, args.repeats)
+    if not args.skip_streaming:
+        results["streaming"] = bench_streaming(helpers, text_processing, args.min_time, args.repeats)
+    if not args.skip_rerender:
+        results["rerender"] = bench_rerender(text_processing, args.min_time, args.repeats)
+    if not args.skip_publish:
+        results["publish"] = bench_publish(helpers, const, args.min_time, args.repeats)
+    if not args.skip_schedule:
+        results["schedule"] = bench_schedule(helpers, const, load("scheduler"))
+    if not args.skip_settle:
+        results["settle"] = bench_settle(helpers, const, load("settle"))
+    if not args.skip_loop_block:
+        results["loop_block"] = bench_loop_block(helpers, args.repeats)
+    if not args.skip_dispatch:
+        results["dispatch"] = bench_dispatch(load("__init__"), const, args.repeats)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(results, json.load(file))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
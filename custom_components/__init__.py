@@ -3,14 +3,37 @@ import asyncio
 import json
 import logging
 
+import voluptuous as vol
+
 from homeassistant.components import mqtt
 from homeassistant.components.mqtt.models import ReceiveMessage
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
 
-from .const import ATTR_TEXT, CONF_COMMAND_TOPIC, DOMAIN
+from .command_throttle import CommandThrottle
+from .const import (
+    ATTR_GROUP,
+    ATTR_MESSAGES,
+    ATTR_TEMPLATE,
+    ATTR_TEXT,
+    DOMAIN,
+    LAYOUT_CACHE_SIZE,
+    SERVICE_DISPLAY_GROUP_TEXT,
+    SERVICE_DISPLAY_TEXT,
+)
+from .display_queue import DisplayQueue
+from .group import async_display_group_text
+from .layout_cache import LayoutCache
+from .playback_store import PlaybackStore
+from .regions import RowRegions
+from .runtime import DisplaySettings, SplitflapConfigEntry, SplitflapData
+from .scheduler import get_scheduler
+from .settle import SettleTracker
+from .stats import DisplayStats
+from .text import DISPLAY_OPTIONS_SCHEMA
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,31 +42,59 @@ PLATFORMS: list[Platform] = [
     Platform.SELECT,
     Platform.NUMBER,
     Platform.SWITCH,
+    Platform.SENSOR,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Splitflap Display from a config entry."""
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
-        "display_task": None,
-        "blank_task": None,
-        "unsubscribe_mqtt": None,
+DISPLAY_GROUP_TEXT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_GROUP): cv.string,
+        vol.Required(ATTR_TEXT): cv.string,
+        **DISPLAY_OPTIONS_SCHEMA,
     }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Register the services that act on more than one display."""
+
+    async def handle_display_group_text(call: ServiceCall) -> None:
+        """Show a message across every display in a group."""
+        data = dict(call.data)
+        await async_display_group_text(hass, data.pop(ATTR_GROUP), data.pop(ATTR_TEXT), data)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DISPLAY_GROUP_TEXT,
+        handle_display_group_text,
+        schema=DISPLAY_GROUP_TEXT_SCHEMA,
+    )
+    return True
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: SplitflapConfigEntry) -> bool:
+    """Set up Splitflap Display from a config entry."""
+    settings = DisplaySettings.from_entry(entry)
+    data = entry.runtime_data = SplitflapData(
+        settings=settings,
+        stats=DisplayStats(hass),
+        layout_cache=LayoutCache(LAYOUT_CACHE_SIZE),
+    )
+    data.queue = DisplayQueue(hass, entry, PlaybackStore(hass, entry))
+    data.row_regions = RowRegions(hass, entry)
+    entry.async_on_unload(data.stats.async_cancel)
 
     # --- MQTT Command Topic Listener ---
     @callback
-    def mqtt_message_received(msg: ReceiveMessage) -> None:
-        """Handle new MQTT messages from the command topic."""
-        try:
-            payload = json.loads(msg.payload)
-            if not isinstance(payload, dict) or ATTR_TEXT not in payload:
-                _LOGGER.warning("Invalid JSON on command topic %s: 'text' key missing.", msg.topic)
-                return
-        except json.JSONDecodeError:
-            _LOGGER.warning("Ignoring non-JSON message on command topic %s.", msg.topic)
+    def dispatch_command(payload: dict) -> None:
+        """Send a command payload to the text entity."""
+        text_entity = data.text_entity
+        if text_entity is not None:
+            text_entity.async_handle_command(payload)
             return
 
+        # The entity has not been added yet; let the service layer find it.
         ent_reg = async_get_entity_registry(hass)
         text_entity_id = ent_reg.async_get_entity_id(
             Platform.TEXT, DOMAIN, f"{DOMAIN}_{entry.entry_id}_text"
@@ -56,35 +107,95 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         service_data = {"entity_id": text_entity_id}
         service_data.update(payload)
         hass.async_create_task(
-            hass.services.async_call("text", "set_value", service_data, blocking=False)
+            hass.services.async_call(DOMAIN, SERVICE_DISPLAY_TEXT, service_data, blocking=False)
         )
 
-    command_topic = entry.data.get(CONF_COMMAND_TOPIC)
-    if command_topic:
-        unsubscribe_mqtt = await mqtt.async_subscribe(
-            hass, command_topic, mqtt_message_received, 1
+    throttle = data.command_throttle = CommandThrottle(
+        hass, dispatch_command, settings.command_rate_limit, settings.command_burst
+    )
+    entry.async_on_unload(throttle.cancel)
+
+    @callback
+    def mqtt_message_received(msg: ReceiveMessage) -> None:
+        """Handle new MQTT messages from the command topic."""
+        try:
+            payload = json.loads(msg.payload)
+            if isinstance(payload, list):
+                payload = {ATTR_MESSAGES: payload}
+            if not isinstance(payload, dict) or not any(
+                key in payload for key in (ATTR_TEXT, ATTR_MESSAGES, ATTR_TEMPLATE)
+            ):
+                throttle.dropped += 1
+                _LOGGER.warning(
+                    "Invalid JSON on command topic %s: 'text', 'messages' or 'template' key missing.",
+                    msg.topic,
+                )
+                return
+        except json.JSONDecodeError:
+            throttle.dropped += 1
+            _LOGGER.warning("Ignoring non-JSON message on command topic %s.", msg.topic)
+            return
+
+        throttle.submit(payload)
+
+    if settings.command_topic:
+        data.unsubscribe_mqtt = await mqtt.async_subscribe(
+            hass, settings.command_topic, mqtt_message_received, 1
         )
-        hass.data[DOMAIN][entry.entry_id]["unsubscribe_mqtt"] = unsubscribe_mqtt
+
+    # --- MQTT State Topic Listener ---
+    if settings.state_topic:
+        settle_tracker = SettleTracker(hass, entry.title)
+        await settle_tracker.async_start(settings.state_topic)
+        data.settle_tracker = settle_tracker
+
+    entry.async_on_unload(entry.add_update_listener(async_options_updated))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await data.queue.async_restore()
 
     return True
 
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
-    entry_data = hass.data[DOMAIN].get(entry.entry_id, {})
+async def async_options_updated(hass: HomeAssistant, entry: SplitflapConfigEntry) -> None:
+    """Resolve the changed options and apply them to the entry's cache and command throttle.
+
+    The number, select and switch entities change options too, so this is
+    also how their changes reach the next message.
+    """
+    data = entry.runtime_data
+    settings = data.settings = DisplaySettings.from_entry(entry)
+    data.layout_cache.clear()
+    data.command_throttle.configure(settings.command_rate_limit, settings.command_burst)
 
-    if entry_data.get("unsubscribe_mqtt"):
-        entry_data["unsubscribe_mqtt"]()
-    if entry_data.get("display_task"):
-        entry_data["display_task"].cancel()
-    if entry_data.get("blank_task"):
-        entry_data["blank_task"].cancel()
+
+async def async_unload_entry(hass: HomeAssistant, entry: SplitflapConfigEntry) -> bool:
+    """Unload a config entry."""
+    data = entry.runtime_data
+
+    if data.unsubscribe_mqtt:
+        data.unsubscribe_mqtt()
+    await data.queue.async_stop()
+    if data.group_playback:
+        data.group_playback.leave(entry)
+    data.row_regions.cancel()
+    if data.unsub_keyframe:
+        data.unsub_keyframe()
+    if data.settle_tracker is not None:
+        data.settle_tracker.async_stop()
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+    if unload_ok and not any(
+        other.state is ConfigEntryState.LOADED
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        get_scheduler(hass).cancel_all()
+
+    return unload_ok
+
 
-    return unload_ok
\ No newline at end of file
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored message of a removed config entry."""
+    await PlaybackStore(hass, entry).async_remove()
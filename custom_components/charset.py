@@ -0,0 +1,111 @@
+"""Flap character set normalization for the Splitflap integration."""
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Characters without a useful Unicode decomposition, spelled with ASCII.
+_TRANSLITERATIONS = {
+    "ß": "SS",
+    "ẞ": "SS",
+    "Æ": "AE",
+    "Œ": "OE",
+    "Ø": "O",
+    "Đ": "D",
+    "Ł": "L",
+    "Þ": "TH",
+    "‘": "'",
+    "’": "'",
+    "‚": ",",
+    "“": '"',
+    "”": '"',
+    "„": '"',
+    "–": "-",
+    "—": "-",
+    "…": "...",
+    "€": "EUR",
+    "£": "GBP",
+    "°": "DEG",
+}
+
+# Code points translated up front; anything else is resolved on first use.
+_PRECOMPILED_RANGE = range(0x20, 0x250)
+
+
+class FlapTranslationTable(Dict[int, str]):
+    """str.translate table mapping any character onto the flaps of a display.
+
+    Characters the display lacks are tried uppercased, then transliterated,
+    then with their accents removed, and are shown as a blank flap when none
+    of those are supported.
+    """
+
+    def __init__(self, alphabet: str) -> None:
+        """Build the table for the given flap characters."""
+        super().__init__()
+        # The blank flap always exists; padding and word breaks rely on it.
+        self._alphabet = frozenset(alphabet) | {" "}
+        for code_point in _PRECOMPILED_RANGE:
+            self[code_point] = self._resolve(chr(code_point))
+
+    def __missing__(self, code_point: int) -> str:
+        """Resolve and remember a character outside the precompiled range."""
+        replacement = self._resolve(chr(code_point))
+        self[code_point] = replacement
+        return replacement
+
+    def _resolve(self, char: str) -> str:
+        if char in self._alphabet:
+            return char
+        upper = char.upper()
+        for candidate in (
+            upper,
+            _TRANSLITERATIONS.get(upper, ""),
+            "".join(
+                c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c)
+            ).upper(),
+        ):
+            if candidate and all(c in self._alphabet for c in candidate):
+                return candidate
+        return " "
+
+
+@lru_cache(maxsize=8)
+def get_translation_table(alphabet: str) -> Optional[FlapTranslationTable]:
+    """Return the shared translation table for alphabet, or None to allow everything."""
+    if not alphabet:
+        return None
+    return FlapTranslationTable(alphabet)
+
+
+@lru_cache(maxsize=8)
+def get_flap_positions(order: str) -> Dict[str, int]:
+    """Map each flap character to its position on the drum.
+
+    The blank flap is assumed to come first when order does not include it.
+    """
+    if " " not in order:
+        order = " " + order
+    return {char: position for position, char in enumerate(dict.fromkeys(order))}
+
+
+def max_flap_travel(previous: Optional[str], frame: str, positions: Dict[str, int]) -> int:
+    """Return the most flaps any module turns to go from previous to frame.
+
+    Flaps only turn forward. Without a previous frame, or when a character is
+    not on the drum, a module is assumed to need almost a full revolution.
+    """
+    count = len(positions)
+    if previous is None or len(previous) != len(frame):
+        return count - 1
+    worst = 0
+    for old, new in zip(previous, frame):
+        if old == new:
+            continue
+        start = positions.get(old)
+        end = positions.get(new)
+        if start is None or end is None:
+            return count - 1
+        travel = (end - start) % count
+        if travel > worst:
+            worst = travel
+    return worst
@@ -0,0 +1,155 @@
+"""Rate limiting for the Splitflap command topic."""
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import ATTR_COALESCE_KEY, ATTR_PRIORITY, ATTR_ROW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandThrottle:
+    """Token bucket in front of the command topic that coalesces bursts.
+
+    Up to burst payloads are dispatched immediately, then one per 1/rate
+    seconds. Payloads arriving while the bucket is empty are held, one per
+    priority, row and coalesce key: a newer payload replaces only the one
+    held with the same ones, so a flood of chatty messages cannot push out
+    an alert, and an update to one row cannot push out another row's or the
+    whole display's. When a token frees up the held payload with the
+    highest priority goes first. A rate of 0 dispatches everything
+    immediately.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        dispatch: Callable[[Dict[str, Any]], None],
+        rate: float,
+        burst: int,
+    ) -> None:
+        """Initialize the throttle with a full bucket."""
+        self._hass = hass
+        self._dispatch = dispatch
+        self._rate = rate
+        self._burst = max(burst, 1)
+        self._tokens = float(self._burst)
+        self._updated = hass.loop.time()
+        self._pending: Dict[Hashable, Dict[str, Any]] = {}
+        self._unsub_release: Optional[CALLBACK_TYPE] = None
+        self.dispatched = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    @callback
+    def configure(self, rate: float, burst: int) -> None:
+        """Apply new limits, releasing any held payload under them."""
+        self._refill()
+        self._rate = rate
+        self._burst = max(burst, 1)
+        self._tokens = min(self._tokens, self._burst)
+        if self._pending:
+            self._cancel_release()
+            self._release()
+
+    @callback
+    def submit(self, payload: Dict[str, Any]) -> None:
+        """Dispatch payload now if the bucket allows it, otherwise hold it."""
+        if self._rate <= 0:
+            self._send(payload)
+            return
+
+        self._refill()
+        if not self._pending and self._tokens >= 1:
+            self._tokens -= 1
+            self._send(payload)
+            return
+
+        slot = _slot(payload)
+        if slot in self._pending:
+            self.coalesced += 1
+        self._pending[slot] = payload
+        if self._unsub_release is None:
+            self._schedule_release()
+
+    @callback
+    def cancel(self) -> None:
+        """Drop any held payloads and stop the release timer."""
+        self._pending.clear()
+        self._cancel_release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return throttle counters for diagnostics."""
+        return {
+            "rate": self._rate,
+            "burst": self._burst,
+            "dispatched": self.dispatched,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "pending": len(self._pending),
+        }
+
+    def _refill(self) -> None:
+        now = self._hass.loop.time()
+        if self._rate > 0:
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _send(self, payload: Dict[str, Any]) -> None:
+        self.dispatched += 1
+        self._dispatch(payload)
+
+    def _schedule_release(self) -> None:
+        delay = (1 - self._tokens) / self._rate
+        self._unsub_release = async_call_later(self._hass, max(delay, 0), self._async_release)
+
+    def _cancel_release(self) -> None:
+        if self._unsub_release is not None:
+            self._unsub_release()
+            self._unsub_release = None
+
+    @callback
+    def _async_release(self, _now: Any) -> None:
+        self._unsub_release = None
+        self._release()
+
+    def _release(self) -> None:
+        if self._rate <= 0:
+            while self._pending:
+                self._send(self._pop_next())
+            return
+
+        self._refill()
+        while self._pending and self._tokens >= 1:
+            self._tokens -= 1
+            self._send(self._pop_next())
+        if self._pending:
+            self._schedule_release()
+
+    def _pop_next(self) -> Dict[str, Any]:
+        """Remove and return the held payload of highest priority, oldest first."""
+        slot = max(self._pending, key=lambda slot: slot[0])
+        return self._pending.pop(slot)
+
+
+def _slot(payload: Dict[str, Any]) -> Hashable:
+    """Return the slot a held payload takes: its priority, row and coalesce key.
+
+    Payloads for the whole display have no row.
+    """
+    coalesce_key = payload.get(ATTR_COALESCE_KEY)
+    return (
+        _as_int(payload.get(ATTR_PRIORITY, 0)) or 0,
+        _as_int(payload.get(ATTR_ROW)),
+        None if coalesce_key is None else str(coalesce_key),
+    )
+
+
+def _as_int(value: Any) -> Optional[int]:
+    """Return value as an int, or None when it is missing or not a number."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -7,6 +7,7 @@ from .const import (
     DOMAIN,
     CONF_MQTT_TOPIC,
     CONF_COMMAND_TOPIC,
+    CONF_STATE_TOPIC,
     CONF_NUM_MODULES,
     CONF_NUM_ROWS,
     CONF_CENTER_TEXT,
@@ -14,6 +15,14 @@ from .const import (
     CONF_REPEAT_MULTIPAGE,
     CONF_OVERFLOW_TYPE,
     CONF_BLANK_TIMER,
+    CONF_FLAP_ALPHABET,
+    CONF_COMMAND_RATE_LIMIT,
+    CONF_COMMAND_BURST,
+    CONF_GROUP,
+    CONF_GROUP_POSITION,
+    CONF_PACING,
+    CONF_FLAP_STEP_TIME,
+    CONF_PAYLOAD_FORMAT,
     DEFAULT_NUM_MODULES,
     DEFAULT_NUM_ROWS,
     DEFAULT_CENTER_TEXT,
@@ -21,7 +30,17 @@ from .const import (
     DEFAULT_REPEAT_MULTIPAGE,
     DEFAULT_OVERFLOW_TYPE,
     DEFAULT_BLANK_TIMER,
+    DEFAULT_FLAP_ALPHABET,
+    DEFAULT_COMMAND_RATE_LIMIT,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_GROUP,
+    DEFAULT_GROUP_POSITION,
+    DEFAULT_PACING,
+    DEFAULT_FLAP_STEP_TIME,
+    DEFAULT_PAYLOAD_FORMAT,
     OVERFLOW_TYPES,
+    PACING_TYPES,
+    PAYLOAD_FORMATS,
 )
 
 
@@ -48,6 +67,7 @@ class SplitflapConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 {
                     vol.Required(CONF_MQTT_TOPIC, default=base_topic): str,
                     vol.Required(CONF_COMMAND_TOPIC, default=f"{base_topic}/command"): str,
+                    vol.Optional(CONF_STATE_TOPIC): str,
                     vol.Required(CONF_NUM_MODULES, default=DEFAULT_NUM_MODULES): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
                     vol.Required(CONF_NUM_ROWS, default=DEFAULT_NUM_ROWS): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
                 }
@@ -107,6 +127,54 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_REPEAT_MULTIPAGE, DEFAULT_REPEAT_MULTIPAGE
                     ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_PACING,
+                    default=self.config_entry.options.get(
+                        CONF_PACING, DEFAULT_PACING
+                    ),
+                ): vol.In(PACING_TYPES),
+                vol.Optional(
+                    CONF_FLAP_STEP_TIME,
+                    default=self.config_entry.options.get(
+                        CONF_FLAP_STEP_TIME, DEFAULT_FLAP_STEP_TIME
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_FLAP_ALPHABET,
+                    default=self.config_entry.options.get(
+                        CONF_FLAP_ALPHABET, DEFAULT_FLAP_ALPHABET
+                    ),
+                ): str,
+                vol.Optional(
+                    CONF_PAYLOAD_FORMAT,
+                    default=self.config_entry.options.get(
+                        CONF_PAYLOAD_FORMAT, DEFAULT_PAYLOAD_FORMAT
+                    ),
+                ): vol.In(PAYLOAD_FORMATS),
+                vol.Optional(
+                    CONF_COMMAND_RATE_LIMIT,
+                    default=self.config_entry.options.get(
+                        CONF_COMMAND_RATE_LIMIT, DEFAULT_COMMAND_RATE_LIMIT
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_COMMAND_BURST,
+                    default=self.config_entry.options.get(
+                        CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_GROUP,
+                    default=self.config_entry.options.get(
+                        CONF_GROUP, DEFAULT_GROUP
+                    ),
+                ): str,
+                vol.Optional(
+                    CONF_GROUP_POSITION,
+                    default=self.config_entry.options.get(
+                        CONF_GROUP_POSITION, DEFAULT_GROUP_POSITION
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
             }
         )
 
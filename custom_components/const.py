@@ -1,8 +1,10 @@
 DOMAIN = "splitflap"
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
 
 # Configuration Keys
 CONF_MQTT_TOPIC = "mqtt_topic"
 CONF_COMMAND_TOPIC = "command_topic"
+CONF_STATE_TOPIC = "state_topic"
 CONF_NUM_MODULES = "num_modules"
 CONF_NUM_ROWS = "num_rows"
 CONF_CENTER_TEXT = "center_text"
@@ -10,6 +12,14 @@ CONF_DELAY_BETWEEN_PAGES = "delay_between_pages"
 CONF_REPEAT_MULTIPAGE = "repeat_multipage_messages"
 CONF_OVERFLOW_TYPE = "overflow_type"
 CONF_BLANK_TIMER = "blank_display_timer"
+CONF_FLAP_ALPHABET = "flap_alphabet"
+CONF_COMMAND_RATE_LIMIT = "command_rate_limit"
+CONF_COMMAND_BURST = "command_burst"
+CONF_GROUP = "group"
+CONF_GROUP_POSITION = "group_position"
+CONF_PACING = "pacing"
+CONF_FLAP_STEP_TIME = "flap_step_time"
+CONF_PAYLOAD_FORMAT = "payload_format"
 
 # Defaults
 DEFAULT_NUM_MODULES = 20
@@ -19,10 +29,57 @@ DEFAULT_DELAY_BETWEEN_PAGES = 5
 DEFAULT_REPEAT_MULTIPAGE = 0
 DEFAULT_OVERFLOW_TYPE = "new line"
 DEFAULT_BLANK_TIMER = 300  
+DEFAULT_FLAP_ALPHABET = ""
+DEFAULT_COMMAND_RATE_LIMIT = 2.0
+DEFAULT_COMMAND_BURST = 3
+DEFAULT_GROUP = ""
+DEFAULT_GROUP_POSITION = 0
+DEFAULT_PACING = "fixed"
+DEFAULT_FLAP_STEP_TIME = 0.06
+DEFAULT_PAYLOAD_FORMAT = "full"
+# Flap order of the standard 40 flap module, used when no flap alphabet is set.
+DEFAULT_FLAP_ORDER = " ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.,'"
 
 # Constants
-OVERFLOW_TYPES = ["new line", "hyphen", "none"]
+OVERFLOW_OPTIMAL = "optimal"
+OVERFLOW_SCROLL = "scroll"
+OVERFLOW_TYPES = ["new line", "hyphen", "none", OVERFLOW_OPTIMAL, OVERFLOW_SCROLL]
+SCROLL_MIN_STEP = 0.2
+PACING_FLAP_TRAVEL = "flap travel"
+PACING_TYPES = ["fixed", PACING_FLAP_TRAVEL]
+PAYLOAD_FORMAT_DELTA = "delta"
+PAYLOAD_FORMATS = [DEFAULT_PAYLOAD_FORMAT, PAYLOAD_FORMAT_DELTA]
+DELTA_KEYFRAME_INTERVAL = 20
+DELTA_KEYFRAME_DELAY = 60
+LAYOUT_CACHE_SIZE = 64
+LAZY_LAYOUT_MIN_CHARS = 4096
+LAYOUT_EXECUTOR_MIN_CHARS = 2048
+STATS_SAMPLE_SIZE = 256
+PUBLISH_LATENCY_SMOOTHING = 0.2
+STATS_UPDATE_INTERVAL = 10
+RECENT_MESSAGES_SIZE = 20
+RECENT_MESSAGE_MAX_CHARS = 255
+STORAGE_VERSION = 1
+STORE_SAVE_DELAY = 10
+RETAINED_FRAME_TIMEOUT = 2
+# Reported on the state topic once the flaps stop moving.
+STATE_SETTLED = "settled"
+TEMPLATE_RATE_LIMIT = 1.0
+PREVIEW_CHUNK_SIZE = 16
+PREVIEW_EXECUTOR_MIN_CHARS = 4096
+PREVIEW_MAX_PAGES = 50
+TEMPLATE_COALESCE_KEY = "template"
 SERVICE_DISPLAY_TEXT = "display_text"
+SERVICE_DISPLAY_GROUP_TEXT = "display_group_text"
+SERVICE_PREVIEW_LAYOUT = "preview_layout"
 
 # Service Attributes
-ATTR_TEXT = "text"
\ No newline at end of file
+ATTR_TEXT = "text"
+ATTR_MESSAGES = "messages"
+ATTR_TEMPLATE = "template"
+ATTR_TEXTS = "texts"
+ATTR_ROW = "row"
+ATTR_GROUP = "group"
+ATTR_PRIORITY = "priority"
+ATTR_TTL = "ttl"
+ATTR_COALESCE_KEY = "coalesce_key"
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""Compact delta payloads for the Splitflap integration.
+
+A delta lists the runs of modules that changed since the previous frame.
+``<start>,<length>:<characters>`` sets length modules from start to the
+characters that follow, and ``<start>,<length>_`` blanks them. Runs are
+concatenated without separators. Deltas are published, not retained, to
+the display topic with DELTA_TOPIC_SUFFIX; full frames, the keyframes,
+stay on the display topic itself.
+"""
+import re
+from typing import Iterator, List, Tuple
+
+DELTA_TOPIC_SUFFIX = "/delta"
+
+# Shorter runs of spaces are cheaper sent as characters than as a blank span.
+_BLANK_SPAN_RE = re.compile(r" {6,}")
+_RUN_RE = re.compile(r"(\d+),(\d+)([:_])")
+
+
+def _changed_runs(previous: str, frame: str) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) of the runs of modules that differ.
+
+    Runs separated by fewer unchanged modules than a run header costs are
+    merged, the unchanged modules being resent as characters.
+    """
+    changed = [index for index, (old, new) in enumerate(zip(previous, frame)) if old != new]
+    if not changed:
+        return
+    start = end = changed[0]
+    for index in changed[1:]:
+        if index - end - 1 <= len(str(index)) + 2:
+            end = index
+            continue
+        yield start, end + 1
+        start = end = index
+    yield start, end + 1
+
+
+def encode_delta(previous: str, frame: str) -> str:
+    """Return the delta that turns previous into frame, of the same length."""
+    parts: List[str] = []
+    for start, end in _changed_runs(previous, frame):
+        position = start
+        for match in _BLANK_SPAN_RE.finditer(frame, start, end):
+            if match.start() > position:
+                parts.append(f"{position},{match.start() - position}:{frame[position:match.start()]}")
+            parts.append(f"{match.start()},{match.end() - match.start()}_")
+            position = match.end()
+        if position < end:
+            parts.append(f"{position},{end - position}:{frame[position:end]}")
+    return "".join(parts)
+
+
+def apply_delta(frame: str, delta: str) -> str:
+    """Return frame with delta applied, as a display's firmware would.
+
+    Raises ValueError for a malformed delta.
+    """
+    modules = list(frame)
+    position = 0
+    while position < len(delta):
+        match = _RUN_RE.match(delta, position)
+        if match is None:
+            raise ValueError(f"Malformed delta at {position}")
+        start, length = int(match.group(1)), int(match.group(2))
+        if start + length > len(modules):
+            raise ValueError(f"Delta run {start},{length} is past the end of the frame")
+        position = match.end()
+        if match.group(3) == "_":
+            modules[start:start + length] = " " * length
+            continue
+        characters = delta[position:position + length]
+        if len(characters) != length:
+            raise ValueError(f"Delta run {start},{length} is truncated")
+        modules[start:start + length] = characters
+        position += length
+    return "".join(modules)
@@ -0,0 +1,32 @@
+"""Diagnostics support for the Splitflap integration."""
+from typing import Any, Dict
+
+from homeassistant.core import HomeAssistant
+
+from .runtime import SplitflapConfigEntry
+from .scheduler import get_scheduler
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: SplitflapConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = entry.runtime_data
+    return {
+        "data": dict(entry.data),
+        "options": dict(entry.options),
+        "layout_cache": data.layout_cache.stats(),
+        "command_throttle": data.command_throttle.stats() if data.command_throttle else None,
+        "queue": data.queue.stats(),
+        "row_regions": data.row_regions.stats() if data.row_regions is not None else None,
+        "scheduler": get_scheduler(hass).stats(),
+        "stats": data.stats.as_dict(),
+        "settle": data.settle_tracker.stats() if data.settle_tracker is not None else None,
+        "display": {
+            "last_frame": data.last_frame,
+            "last_modules_changed": data.last_modules_changed,
+            "frames_published": data.frames_published,
+            "frames_suppressed": data.frames_suppressed,
+            "frames_since_keyframe": data.frames_since_keyframe,
+        },
+    }
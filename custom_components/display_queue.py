@@ -0,0 +1,239 @@
+"""Per-entry message scheduling for the Splitflap integration."""
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .helpers import PagePlayback, display_pages
+from .runtime import SplitflapConfigEntry
+from .stats import DisplayStats
+
+if TYPE_CHECKING:
+    from .playback_store import PlaybackStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class QueuedMessage:
+    """A laid out message waiting for, or holding, the display."""
+
+    pages: Iterable[str]
+    delay: Optional[int]
+    repeat: int
+    blank_timer: int
+    priority: int = 0
+    expires_at: Optional[float] = None
+    coalesce_key: Optional[str] = None
+    sequence: int = 0
+    dropped: bool = field(default=False, repr=False)
+
+    def is_expired(self, now: float) -> bool:
+        """Return True once the message's time to live has passed."""
+        return self.expires_at is not None and now >= self.expires_at
+
+
+class DisplayQueue:
+    """Decide which message a display shows.
+
+    A message with a higher priority than the one being shown preempts it,
+    and the preempted message is queued again. One of equal priority
+    replaces it, as a new value always did. Lower priority messages wait
+    until the display is free. Messages sharing a coalesce key collapse
+    into the newest one, and expired messages are dropped.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: SplitflapConfigEntry,
+        store: Optional["PlaybackStore"] = None,
+    ) -> None:
+        """Initialize an empty queue for a config entry, persisted to store if given."""
+        self._hass = hass
+        self._config_entry = config_entry
+        self._store = store
+        self._heap: List[Tuple[int, int, QueuedMessage]] = []
+        self._keyed: Dict[str, QueuedMessage] = {}
+        self._sequence = itertools.count()
+        self._current: Optional[QueuedMessage] = None
+        self._playback: Optional[PagePlayback] = None
+        self.dropped_expired = 0
+        self.coalesced = 0
+        self.preempted = 0
+
+    @property
+    def current(self) -> Optional[QueuedMessage]:
+        """Return the message holding the display, if any."""
+        return self._current
+
+    @property
+    def playback(self) -> Optional[PagePlayback]:
+        """Return the playback of the current or last message, if any."""
+        return self._playback
+
+    def __len__(self) -> int:
+        """Return the number of messages waiting for the display."""
+        return sum(1 for _, _, message in self._heap if not message.dropped)
+
+    def submit(self, message: QueuedMessage) -> None:
+        """Show message now or queue it behind higher priority messages."""
+        message.sequence = next(self._sequence)
+        current = self._current
+
+        if message.coalesce_key is not None:
+            waiting = self._keyed.pop(message.coalesce_key, None)
+            if waiting is not None:
+                waiting.dropped = True
+                self.coalesced += 1
+            if current is not None and current.coalesce_key == message.coalesce_key:
+                self.coalesced += 1
+                self._start(message)
+                return
+
+        if current is None or message.priority == current.priority:
+            self._start(message)
+        elif message.priority > current.priority:
+            self.preempted += 1
+            self._push(current)
+            self._start(message)
+        else:
+            self._push(message)
+
+    def clear(self, priority: Optional[int] = None) -> bool:
+        """Stop the current message and drop everything waiting.
+
+        With priority, as for a blank sent with one, messages of a higher
+        priority are kept, and the highest waiting one is shown if the
+        current message was stopped. Returns True when the display was left
+        free.
+        """
+        kept = []
+        for entry in self._heap:
+            message = entry[2]
+            if priority is not None and message.priority > priority and not message.dropped:
+                kept.append(entry)
+            else:
+                message.dropped = True
+        self._heap = kept
+        heapq.heapify(self._heap)
+        self._keyed = {key: message for key, message in self._keyed.items() if not message.dropped}
+        self._save_later()
+        if self._current is not None and priority is not None and self._current.priority > priority:
+            return False
+
+        self._current = None
+        self._cancel_playback()
+        message = self._pop()
+        if message is None:
+            return True
+        self._start(message)
+        return False
+
+    async def async_restore(self) -> None:
+        """Resume the message that was being shown when the store was last saved."""
+        if self._store is None:
+            return
+        restored = await self._store.async_load()
+        if restored is None:
+            return
+        message, position = restored
+        message.sequence = next(self._sequence)
+        _LOGGER.debug("Resuming stored message for %s at page %d", self._config_entry.title, position)
+        self._start(message, skip=position)
+
+    async def async_stop(self) -> None:
+        """Save the current message for the next start, then stop showing it."""
+        if self._store is not None:
+            await self._store.async_save(self)
+            self._store = None
+        self.clear()
+
+    def stats(self) -> Dict[str, object]:
+        """Return queue counters for diagnostics."""
+        return {
+            "depth": len(self),
+            "current_priority": self._current.priority if self._current else None,
+            "dropped_expired": self.dropped_expired,
+            "coalesced": self.coalesced,
+            "preempted": self.preempted,
+        }
+
+    def _push(self, message: QueuedMessage) -> None:
+        heapq.heappush(self._heap, (-message.priority, message.sequence, message))
+        if message.coalesce_key is not None:
+            self._keyed[message.coalesce_key] = message
+        self._stats.async_schedule_update()
+
+    def _pop(self) -> Optional[QueuedMessage]:
+        now = self._hass.loop.time()
+        while self._heap:
+            _, _, message = heapq.heappop(self._heap)
+            if message.dropped:
+                continue
+            if message.coalesce_key is not None:
+                self._keyed.pop(message.coalesce_key, None)
+            if message.is_expired(now):
+                self.dropped_expired += 1
+                continue
+            self._stats.async_schedule_update()
+            return message
+        return None
+
+    @property
+    def _stats(self) -> DisplayStats:
+        return self._config_entry.runtime_data.stats
+
+    def _cancel_playback(self) -> None:
+        if self._playback is not None:
+            if self._playback.cancel():
+                self._stats.record_cancellation()
+            self._playback = None
+        data = self._config_entry.runtime_data
+        data.group_layout = None
+        if data.group_playback is not None:
+            # The other members keep showing the group's message.
+            if data.group_playback.leave(self._config_entry):
+                self._stats.record_cancellation()
+            data.group_playback = None
+
+    def _save_later(self) -> None:
+        if self._store is not None:
+            self._store.async_save_later(self)
+
+    def _start(self, message: QueuedMessage, when: Optional[float] = None, skip: int = 0) -> None:
+        self._cancel_playback()
+        self._current = message
+        self._playback = display_pages(
+            self._hass,
+            self._config_entry,
+            message.pages,
+            message.delay,
+            message.repeat,
+            message.blank_timer,
+            message.expires_at,
+            self._message_done,
+            when,
+            skip,
+            # The store's delay debounces these, and a save still pending
+            # is written when Home Assistant stops.
+            self._save_later,
+        )
+        self._save_later()
+
+    def _message_done(self, when: float) -> None:
+        """Show the next queued message from when the previous one ended."""
+        message = self._pop()
+        if message is None:
+            self._current = None
+            self._save_later()
+            return
+        _LOGGER.debug(
+            "Showing queued message for %s with priority %d",
+            self._config_entry.title,
+            message.priority,
+        )
+        self._start(message, when)
@@ -0,0 +1,198 @@
+"""Display groups: several splitflap entries acting as one canvas."""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    CONF_BLANK_TIMER,
+    CONF_CENTER_TEXT,
+    CONF_DELAY_BETWEEN_PAGES,
+    CONF_OVERFLOW_TYPE,
+    CONF_REPEAT_MULTIPAGE,
+    DOMAIN,
+)
+from .helpers import (
+    PagePlayback,
+    Playlist,
+    async_publish_frame,
+    blank_display,
+    async_layout_canvas,
+    get_page_dwell,
+)
+from .runtime import SplitflapConfigEntry
+from .scheduler import get_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GroupError(HomeAssistantError):
+    """Raised when a display group cannot be used as one canvas."""
+
+
+def get_group_members(hass: HomeAssistant, group: str) -> List[SplitflapConfigEntry]:
+    """Return the loaded entries of a group, ordered left to right."""
+    if not group:
+        raise GroupError("A group name is required")
+    members = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED and entry.runtime_data.settings.group == group
+    ]
+    if not members:
+        raise GroupError(f"No loaded splitflap displays in group '{group}'")
+
+    members.sort(key=lambda entry: (entry.runtime_data.settings.group_position, entry.title))
+    num_rows = {entry.runtime_data.settings.num_rows for entry in members}
+    if len(num_rows) > 1:
+        raise GroupError(f"Displays in group '{group}' do not all have the same number of rows")
+    return members
+
+
+class GroupPlayback:
+    """A message shown across a group, and the members still showing it.
+
+    A member given a message of its own leaves the group's message while
+    the others keep paging through it; it is cancelled once none is left.
+    """
+
+    def __init__(self, members: Sequence[SplitflapConfigEntry]) -> None:
+        """Initialize with every member showing the message."""
+        self.members = list(members)
+        self.playback: Optional[PagePlayback] = None
+
+    def leave(self, entry: SplitflapConfigEntry) -> bool:
+        """Stop showing the message on entry.
+
+        Returns True when entry was still showing its pages.
+        """
+        if entry not in self.members:
+            return False
+        self.members.remove(entry)
+        was_showing = self.playback is not None and not self.playback.finished
+        if not self.members and self.playback is not None:
+            self.playback.cancel()
+        return was_showing
+
+
+def slice_page(page: str, widths: Sequence[int], num_rows: int) -> List[str]:
+    """Cut a page of the combined canvas into one frame per member."""
+    total = sum(widths)
+    frames = []
+    offset = 0
+    for width in widths:
+        frames.append(
+            "".join(
+                page[row * total + offset:row * total + offset + width]
+                for row in range(num_rows)
+            )
+        )
+        offset += width
+    return frames
+
+
+def _cancel_member_playbacks(members: Sequence[SplitflapConfigEntry]) -> None:
+    """Stop whatever the members are showing, on their own or as part of a group."""
+    for entry in members:
+        data = entry.runtime_data
+        data.queue.clear()
+        if data.group_playback:
+            if data.group_playback.leave(entry):
+                data.stats.record_cancellation()
+            data.group_playback = None
+
+
+async def async_display_group_text(
+    hass: HomeAssistant, group: str, text: str, overrides: Dict[str, Any]
+) -> None:
+    """Lay out text across a group's combined canvas and show it on every member.
+
+    The leftmost member's options are the defaults for the group, including
+    its flap alphabet.
+    """
+    members = get_group_members(hass, group)
+    _cancel_member_playbacks(members)
+    # Long messages are laid out in the executor; a member sent anything
+    # meanwhile clears its token and does not show this message.
+    token = object()
+    for entry in members:
+        entry.runtime_data.group_layout = token
+
+    if not text or not text.strip():
+        await _async_blank_members(hass, members)
+        return
+
+    leader = members[0].runtime_data.settings
+    widths = [entry.runtime_data.settings.num_modules for entry in members]
+    num_rows = leader.num_rows
+    start = time.perf_counter()
+    pages = await async_layout_canvas(
+        hass,
+        text,
+        sum(widths),
+        num_rows,
+        overrides.get(CONF_OVERFLOW_TYPE, leader.overflow_type),
+        overrides.get(CONF_CENTER_TEXT, leader.center_text),
+        leader.flap_alphabet,
+        members[0].runtime_data.stats,
+    )
+    elapsed = time.perf_counter() - start
+    group_playback = GroupPlayback(
+        [entry for entry in members if entry.runtime_data.group_layout is token]
+    )
+    page_count = len(pages) if isinstance(pages, tuple) else None
+    for entry in members:
+        if entry in group_playback.members:
+            entry.runtime_data.stats.record_layout(text, elapsed, page_count)
+        else:
+            entry.runtime_data.stats.record_superseded()
+    if not group_playback.members:
+        return
+    delay = overrides.get(CONF_DELAY_BETWEEN_PAGES, leader.delay)
+
+    async def show(page: str, delay: Optional[float]) -> float:
+        """Publish a page to the members still on it and return the longest dwell any needs."""
+        shown = [
+            (entry, frame)
+            for entry, frame in zip(members, slice_page(page, widths, num_rows))
+            if entry in group_playback.members
+        ]
+        dwell = max(
+            (
+                get_page_dwell(
+                    entry.runtime_data.settings,
+                    entry.runtime_data.last_frame,
+                    frame,
+                    delay,
+                    entry.runtime_data.stats.publish_latency,
+                )
+                for entry, frame in shown
+            ),
+            default=0.0,
+        )
+        await asyncio.gather(*(async_publish_frame(hass, entry, frame) for entry, frame in shown))
+        return dwell
+
+    # Every member flips on the same scheduler deadlines, so they stay together.
+    playback = PagePlayback(
+        get_scheduler(hass),
+        f"group {group}",
+        Playlist(((pages, delay, 0),)),
+        overrides.get(CONF_REPEAT_MULTIPAGE, leader.repeat),
+        overrides.get(CONF_BLANK_TIMER, leader.blank_timer),
+        show,
+        lambda: _async_blank_members(hass, list(group_playback.members)),
+    )
+    group_playback.playback = playback
+    playback.start(hass.loop.time())
+    for entry in group_playback.members:
+        entry.runtime_data.group_playback = group_playback
+
+
+async def _async_blank_members(hass: HomeAssistant, members: Sequence[SplitflapConfigEntry]) -> None:
+    """Blank every member at once."""
+    await asyncio.gather(*(blank_display(hass, entry) for entry in members))
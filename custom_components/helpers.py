@@ -1,48 +1,89 @@
 """Helper functions for the Splitflap integration."""
 import asyncio
 import logging
-from math import ceil
-from typing import Any, Dict, List
+import time
+from collections import deque
+from itertools import chain, islice
+from operator import ne
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from homeassistant.components import mqtt
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 
+from .charset import max_flap_travel
 from .const import (
-    CONF_MQTT_TOPIC,
     CONF_NUM_MODULES,
     CONF_NUM_ROWS,
-    DOMAIN,
+    DELTA_KEYFRAME_DELAY,
+    DELTA_KEYFRAME_INTERVAL,
+    LAYOUT_EXECUTOR_MIN_CHARS,
+    LAZY_LAYOUT_MIN_CHARS,
+    OVERFLOW_OPTIMAL,
+    OVERFLOW_SCROLL,
+    PACING_FLAP_TRAVEL,
+    PAYLOAD_FORMAT_DELTA,
+    RETAINED_FRAME_TIMEOUT,
+    SCROLL_MIN_STEP,
 )
-from .text_processing import Row
+from .delta import DELTA_TOPIC_SUFFIX, encode_delta
+from .layout_cache import LayoutCache
+from .runtime import DisplaySettings, SplitflapConfigEntry
+from .scheduler import DisplayScheduler, ScheduledJob, get_scheduler
+from .stats import DisplayStats
+from .text_processing import Row, iter_processed_chunks, iter_rows
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def get_config_value(
-    overrides: Dict[str, Any], config_entry: ConfigEntry, key: str, default: Any
-) -> Any:
-    """Get a value from an override dict, fallback to config options, then default."""
-    if key in overrides:
-        return overrides[key]
-    return config_entry.options.get(key, default)
-
-
 def create_pages(
-    rows: List[Row], config_entry: ConfigEntry, center: bool
+    rows: Iterable[Row], config_entry: ConfigEntry, center: bool
 ) -> List[str]:
     """Combine rows into pages with corrected centering logic."""
-    rows_per_page = config_entry.data[CONF_NUM_ROWS]
-    modules_per_row = config_entry.data[CONF_NUM_MODULES]
-    pages = []
-    if not rows:
-        return []
-    total_pages = ceil(len(rows) / rows_per_page)
-
-    for page_num in range(total_pages):
-        start_idx = page_num * rows_per_page
-        end_idx = start_idx + rows_per_page
-        page_rows_data = rows[start_idx:end_idx]
+    return list(iter_pages(rows, config_entry, center))
+
+
+def iter_pages(
+    rows: Iterable[Row], config_entry: ConfigEntry, center: bool
+) -> Iterator[str]:
+    """Lazily combine rows into pages, pulling one page worth of rows at a time."""
+    return iter_canvas_pages(
+        rows, config_entry.data[CONF_NUM_MODULES], config_entry.data[CONF_NUM_ROWS], center
+    )
+
+
+def iter_canvas_pages(
+    rows: Iterable[Row], modules_per_row: int, rows_per_page: int, center: bool
+) -> Iterator[str]:
+    """Lazily combine rows into pages for a canvas of the given geometry."""
+    for page, _ in iter_canvas_layouts(rows, modules_per_row, rows_per_page, center):
+        yield page
+
+
+def iter_canvas_layouts(
+    rows: Iterable[Row], modules_per_row: int, rows_per_page: int, center: bool
+) -> Iterator[Tuple[str, bool]]:
+    """Lazily combine rows into pages, yielding each with whether it was centered.
+
+    A page is only centered when every row on it with content can be.
+    """
+    rows = iter(rows)
+
+    while True:
+        page_rows_data = list(islice(rows, rows_per_page))
+        if not page_rows_data:
+            return
 
         while len(page_rows_data) < rows_per_page:
             page_rows_data.append(Row(content=""))
@@ -66,50 +107,632 @@ def create_pages(
             page_content_strings = [
                 row.content.ljust(modules_per_row) for row in page_rows_data
             ]
-        pages.append("".join(page_content_strings))
+        yield "".join(page_content_strings), can_center_page
+
+
+class LazyPages:
+    """Pages of a message that are laid out on demand each time they are iterated.
+
+    Used for long messages so the first page can be published as soon as its
+    rows are fitted and memory does not grow with the message length.
+    """
+
+    __slots__ = ("_text", "_num_modules", "_num_rows", "_overflow_type", "_center", "_alphabet")
+
+    def __init__(
+        self,
+        text: str,
+        num_modules: int,
+        num_rows: int,
+        overflow_type: str,
+        center: bool,
+        alphabet: str,
+    ) -> None:
+        """Initialize the lazy page sequence."""
+        self._text = text
+        self._num_modules = num_modules
+        self._num_rows = num_rows
+        self._overflow_type = overflow_type
+        self._center = center
+        self._alphabet = alphabet
+
+    def __iter__(self) -> Iterator[str]:
+        """Lay out the message again, yielding pages as they are completed."""
+        rows = iter_rows(self._text, self._num_modules, self._overflow_type, self._alphabet)
+        return iter_canvas_pages(rows, self._num_modules, self._num_rows, self._center)
+
+
+class ScrollFrames:
+    """Frames of a message scrolling along a row, generated as they are shown.
+
+    The window moves one module per frame over the processed text, so
+    nothing is laid out up front however long the message is. The message
+    scrolls along the middle row and the other rows are blank; text that
+    fits the row is a single frame.
+    """
+
+    __slots__ = ("_text", "_num_modules", "_num_rows", "_center", "_alphabet")
+
+    def __init__(
+        self, text: str, num_modules: int, num_rows: int, center: bool, alphabet: str
+    ) -> None:
+        """Initialize the lazy frame sequence."""
+        self._text = text
+        self._num_modules = num_modules
+        self._num_rows = num_rows
+        self._center = center
+        self._alphabet = alphabet
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield the frames of the scroll in order."""
+        width = self._num_modules
+        row = (self._num_rows - 1) // 2
+        above = " " * (width * row)
+        below = " " * (width * (self._num_rows - row - 1))
+        chars = chain.from_iterable(iter_processed_chunks(self._text, self._alphabet))
+        window = deque(islice(chars, width), maxlen=width)
+        content = "".join(window)
+        if len(content) < width:
+            if self._center and content.strip():
+                content = content.strip()
+                left_padding = (width - len(content)) // 2
+                content = " " * left_padding + content
+            yield above + content.ljust(width) + below
+            return
+
+        yield above + content + below
+        for char in chars:
+            window.append(char)
+            yield above + "".join(window) + below
+
+
+def layout_canvas(
+    text: str,
+    num_modules: int,
+    num_rows: int,
+    overflow_type: str,
+    center: bool,
+    alphabet: str,
+) -> Iterable[str]:
+    """Lay out text for a canvas of the given geometry.
+
+    Messages of LAZY_LAYOUT_MIN_CHARS or more are not laid out up front; a
+    LazyPages is returned instead of a tuple. So are scrolling messages,
+    as ScrollFrames.
+    """
+    if overflow_type == OVERFLOW_SCROLL:
+        return ScrollFrames(text, num_modules, num_rows, center, alphabet)
+    if len(text) >= LAZY_LAYOUT_MIN_CHARS:
+        return LazyPages(text, num_modules, num_rows, overflow_type, center, alphabet)
+    return _layout_all_pages(text, num_modules, num_rows, overflow_type, center, alphabet)
+
+
+def _layout_all_pages(
+    text: str,
+    num_modules: int,
+    num_rows: int,
+    overflow_type: str,
+    center: bool,
+    alphabet: str,
+) -> Tuple[str, ...]:
+    """Lay out every page of text up front, however long it is."""
+    rows = iter_rows(text, num_modules, overflow_type, alphabet)
+    return tuple(iter_canvas_pages(rows, num_modules, num_rows, center))
+
+
+def layout_pages(
+    text: str,
+    settings: DisplaySettings,
+    overflow_type: str,
+    center: bool,
+    cache: Optional[LayoutCache] = None,
+    num_rows: Optional[int] = None,
+) -> Iterable[str]:
+    """Lay out text into pages, reusing the cached pages for repeated messages.
+
+    Messages of LAZY_LAYOUT_MIN_CHARS or more are neither cached nor laid out
+    up front; a LazyPages is returned instead, or ScrollFrames for scrolling
+    messages of any length. num_rows replaces the display's number of rows,
+    as for a message on a single row.
+    """
+    num_modules = settings.num_modules
+    if num_rows is None:
+        num_rows = settings.num_rows
+    alphabet = settings.flap_alphabet
+    if overflow_type == OVERFLOW_SCROLL or len(text) >= LAZY_LAYOUT_MIN_CHARS:
+        return layout_canvas(text, num_modules, num_rows, overflow_type, center, alphabet)
+
+    key = (text, num_modules, num_rows, overflow_type, center)
+    if cache is not None:
+        pages = cache.get(key)
+        if pages is not None:
+            return pages
+
+    pages = layout_canvas(text, num_modules, num_rows, overflow_type, center, alphabet)
+    if cache is not None:
+        cache.put(key, pages)
     return pages
 
 
-async def blank_display(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    """Publish a blank message to the display topic."""
-    total_modules = (
-        config_entry.data[CONF_NUM_MODULES] * config_entry.data[CONF_NUM_ROWS]
+def layout_blocks_loop(text: str, overflow_type: str, in_full: bool = False) -> bool:
+    """Return whether laying out text up front would hold up the event loop.
+
+    Long messages are otherwise laid out a page at a time as they are shown,
+    but optimal fitting balances every row before the first page is ready.
+    With in_full every page is wanted up front, whatever the mode.
+    """
+    if overflow_type == OVERFLOW_SCROLL or len(text) < LAYOUT_EXECUTOR_MIN_CHARS:
+        return False
+    return in_full or len(text) < LAZY_LAYOUT_MIN_CHARS or overflow_type == OVERFLOW_OPTIMAL
+
+
+async def async_layout_pages(
+    hass: HomeAssistant,
+    text: str,
+    settings: DisplaySettings,
+    overflow_type: str,
+    center: bool,
+    cache: Optional[LayoutCache] = None,
+    stats: Optional[DisplayStats] = None,
+    num_rows: Optional[int] = None,
+    in_full: bool = False,
+) -> Iterable[str]:
+    """Lay out text like layout_pages, in the executor when it would block the loop.
+
+    Messages laid out in the executor are laid out in full, so a long
+    optimally fitted message becomes a tuple rather than a LazyPages; with
+    in_full, so does a long message in any mode. Layouts run on the event
+    loop are recorded in stats as loop slices.
+    """
+    if not layout_blocks_loop(text, overflow_type, in_full):
+        start = time.perf_counter()
+        pages = layout_pages(text, settings, overflow_type, center, cache, num_rows)
+        if stats is not None:
+            stats.record_layout_slice(time.perf_counter() - start)
+        return pages
+
+    if num_rows is None:
+        num_rows = settings.num_rows
+    key = (text, settings.num_modules, num_rows, overflow_type, center)
+    cacheable = cache is not None and len(text) < LAZY_LAYOUT_MIN_CHARS
+    if cacheable:
+        pages = cache.get(key)
+        if pages is not None:
+            return pages
+
+    pages = await async_layout_canvas(
+        hass, text, settings.num_modules, num_rows, overflow_type, center, settings.flap_alphabet
+    )
+    if cacheable:
+        cache.put(key, pages)
+    return pages
+
+
+async def async_layout_canvas(
+    hass: HomeAssistant,
+    text: str,
+    num_modules: int,
+    num_rows: int,
+    overflow_type: str,
+    center: bool,
+    alphabet: str,
+    stats: Optional[DisplayStats] = None,
+) -> Iterable[str]:
+    """Lay out text like layout_canvas, in the executor when it would block the loop.
+
+    Used for canvases that are not a single display's, such as a group's.
+    """
+    if layout_blocks_loop(text, overflow_type):
+        return await hass.async_add_executor_job(
+            _layout_all_pages, text, num_modules, num_rows, overflow_type, center, alphabet
+        )
+    start = time.perf_counter()
+    pages = layout_canvas(text, num_modules, num_rows, overflow_type, center, alphabet)
+    if stats is not None:
+        stats.record_layout_slice(time.perf_counter() - start)
+    return pages
+
+
+def count_changed_modules(previous: Optional[str], frame: str) -> int:
+    """Return how many modules differ between the previous frame and frame."""
+    if previous is None or len(previous) != len(frame):
+        return len(frame)
+    if previous == frame:
+        return 0
+    return sum(map(ne, previous, frame))
+
+
+def get_page_dwell(
+    settings: DisplaySettings,
+    previous: Optional[str],
+    frame: str,
+    delay: Optional[float],
+    latency: float = 0.0,
+) -> float:
+    """Return how long a page stays up after it is published.
+
+    With flap travel pacing, delay is reading time added to the time the
+    slowest module needs to reach its flap from the previous frame. A delay
+    of None marks a scroll step, which always waits for the modules to
+    settle, plus the publish latency, so frames do not pile up.
+    """
+    if delay is not None and settings.pacing != PACING_FLAP_TRAVEL:
+        return delay
+    travel = max_flap_travel(previous, frame, settings.flap_positions)
+    settle = travel * settings.flap_step_time
+    if delay is None:
+        return max(settle + latency, SCROLL_MIN_STEP)
+    return settle + delay
+
+
+async def async_publish_frame(
+    hass: HomeAssistant, config_entry: SplitflapConfigEntry, frame: str
+) -> int:
+    """Publish a display frame unless it matches the last one published.
+
+    Rows shown by row regions are laid over frame first; see regions.py.
+    With the delta payload format, only the changed modules are sent while
+    they are shorter than the frame; see delta.py. Returns the number of
+    modules the frame changes; nothing is published when that is zero.
+    While the frame restored at startup is checked against the broker,
+    publishing waits for the check.
+    """
+    data = config_entry.runtime_data
+    if data.restore_task is not None and not data.restore_task.done():
+        await data.restore_task
+    if data.row_regions is not None:
+        frame = data.row_regions.compose(frame, update_base=True)
+    previous = data.last_frame
+    changed = count_changed_modules(previous, frame)
+    data.last_modules_changed = changed
+    if not changed:
+        data.frames_suppressed += 1
+        _LOGGER.debug("Frame for %s unchanged, not publishing", config_entry.title)
+        return 0
+
+    topic = data.settings.mqtt_topic
+    payload = frame
+    if (
+        data.settings.payload_format == PAYLOAD_FORMAT_DELTA
+        and previous is not None
+        and len(previous) == len(frame)
+        and data.frames_since_keyframe < DELTA_KEYFRAME_INTERVAL
+    ):
+        delta = encode_delta(previous, frame)
+        if len(delta) < len(frame):
+            payload = delta
+
+    start = time.perf_counter()
+    if payload is frame:
+        await mqtt.async_publish(hass, topic, frame, retain=True)
+        data.frames_since_keyframe = 0
+    else:
+        await mqtt.async_publish(hass, topic + DELTA_TOPIC_SUFFIX, payload)
+        data.frames_since_keyframe += 1
+        _schedule_keyframe(hass, config_entry)
+    size = len(payload.encode())
+    data.stats.record_publish(time.perf_counter() - start, size, len(frame.encode()) - size)
+    data.last_frame = frame
+    data.frames_published += 1
+    _LOGGER.debug("Published frame for %s changing %d modules", config_entry.title, changed)
+    return changed
+
+
+@callback
+def _schedule_keyframe(hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+    """Publish the last frame as a keyframe once no frame has followed a delta for a while.
+
+    The display topic retains the last keyframe, which is what a display
+    that reconnects is shown, so it should not stay behind for long.
+    """
+    data = config_entry.runtime_data
+    if data.unsub_keyframe is not None:
+        data.unsub_keyframe()
+
+    async def _async_publish_keyframe(_now: Any) -> None:
+        data.unsub_keyframe = None
+        frame = data.last_frame
+        if frame is None or not data.frames_since_keyframe:
+            return
+        try:
+            await mqtt.async_publish(hass, data.settings.mqtt_topic, frame, retain=True)
+        except Exception as e:
+            _LOGGER.error("Failed to publish keyframe for %s: %s", config_entry.title, e)
+            return
+        data.frames_since_keyframe = 0
+
+    data.unsub_keyframe = async_call_later(hass, DELTA_KEYFRAME_DELAY, _async_publish_keyframe)
+
+
+async def async_get_retained_frame(
+    hass: HomeAssistant, config_entry: SplitflapConfigEntry, timeout: float = RETAINED_FRAME_TIMEOUT
+) -> Optional[str]:
+    """Return the frame retained on the display topic, or None if none arrives in time."""
+    received: asyncio.Future = hass.loop.create_future()
+
+    @callback
+    def message_received(msg) -> None:
+        if msg.retain and not received.done():
+            received.set_result(msg.payload)
+
+    unsubscribe = await mqtt.async_subscribe(
+        hass, config_entry.runtime_data.settings.mqtt_topic, message_received, 0
     )
-    blank_message = " " * total_modules
-    topic = config_entry.data[CONF_MQTT_TOPIC]
     try:
-        await mqtt.async_publish(hass, topic, blank_message, retain=True)
+        return await asyncio.wait_for(received, timeout)
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        unsubscribe()
+
+
+async def async_restore_last_frame(
+    hass: HomeAssistant, config_entry: SplitflapConfigEntry, frame: str
+) -> bool:
+    """Take frame as already shown if the broker still retains it for the display.
+
+    The display reads the retained frame when it connects, so when it is the
+    frame published before a restart, publishing it again would only flip
+    the modules. Returns whether frame was taken as shown.
+    """
+    retained = await async_get_retained_frame(hass, config_entry)
+    if config_entry.runtime_data.last_frame is not None:
+        return False
+    if retained != frame:
+        _LOGGER.debug("Retained frame for %s differs from the restored one", config_entry.title)
+        return False
+    config_entry.runtime_data.last_frame = frame
+    _LOGGER.debug("Display %s already shows its restored frame", config_entry.title)
+    return True
+
+
+async def blank_display(hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+    """Publish a blank message to the display topic."""
+    settings = config_entry.runtime_data.settings
+    try:
+        await async_publish_frame(hass, config_entry, settings.blank_frame)
     except Exception as e:
-        _LOGGER.error("Failed to blank display on topic %s: %s", topic, e)
+        _LOGGER.error("Failed to blank display on topic %s: %s", settings.mqtt_topic, e)
+
+
+class Playlist:
+    """Laid out messages shown one after another as a single message.
+
+    Each item is the pages of a message with the delay between them and how
+    many extra times they are shown before the next item. Iterating yields
+    (page, delay) pairs; the frames of a scroll between its first and last
+    have a delay of None.
+    """
 
+    __slots__ = ("items",)
 
-async def _async_display_pages(
+    def __init__(self, items: Sequence[Tuple[Iterable[str], float, int]]) -> None:
+        """Initialize the playlist from (pages, delay, repeat) items."""
+        self.items = tuple(items)
+
+    def __iter__(self) -> Iterator[Tuple[str, Optional[float]]]:
+        """Yield every page to show with its delay."""
+        for pages, delay, repeat in self.items:
+            for _ in range(repeat + 1):
+                if isinstance(pages, ScrollFrames):
+                    yield from _iter_scroll(pages, delay)
+                else:
+                    for page in pages:
+                        yield page, delay
+
+
+def _iter_scroll(frames: ScrollFrames, delay: float) -> Iterator[Tuple[str, Optional[float]]]:
+    """Yield a scroll's frames, holding the first and last for delay."""
+    frames = iter(frames)
+    previous = next(frames, None)
+    if previous is None:
+        return
+    step: Optional[float] = delay
+    for frame in frames:
+        yield previous, step
+        previous, step = frame, None
+    yield previous, delay
+
+
+class PagePlayback:
+    """Show a message's pages from scheduler jobs instead of a sleeping task.
+
+    One job publishes a page and schedules the next for when the page's
+    dwell ends, measured from when the page was due, unless advance moves
+    it. After the last page a blanking job is scheduled and on_done is
+    called with the time the message ended. When expires_at (event loop
+    time) passes, the remaining pages are skipped. on_layout is called with
+    the time taken to get each page, which lazy pages spend laying it out,
+    and on_page as each page is started.
+    """
+
+    def __init__(
+        self,
+        scheduler: DisplayScheduler,
+        name: str,
+        pages: "Playlist",
+        repeat: int,
+        blank_timer: int,
+        show: Callable[[str, Optional[float]], Awaitable[float]],
+        blank: Callable[[], Awaitable[None]],
+        expires_at: Optional[float] = None,
+        on_done: Optional[Callable[[float], None]] = None,
+        on_layout: Optional[Callable[[float], None]] = None,
+        on_page: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Initialize a playback; show publishes a page and returns its dwell for a delay."""
+        self._scheduler = scheduler
+        self._name = name
+        self._pages = pages
+        self._repeats_left = repeat
+        self._blank_timer = blank_timer
+        self._show = show
+        self._blank = blank
+        self._expires_at = expires_at
+        self._on_done = on_done
+        self._on_layout = on_layout
+        self._on_page = on_page
+        self._iterator: Iterator[Tuple[str, Optional[float]]] = iter(())
+        self._job: Optional[ScheduledJob] = None
+        self._cancelled = False
+        self._finished = False
+        self._index = 0
+        self._showing = False
+        self._advance_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        """Return True once every page has been shown."""
+        return self._finished
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        """Return the repeats left and how many pages of this pass were started."""
+        return self._repeats_left, self._index
+
+    def start(self, when: float, skip: int = 0) -> None:
+        """Show the first page, or the page after skip pages, at event loop time when."""
+        self._iterator = islice(iter(self._pages), skip, None)
+        self._index = skip
+        self._job = self._scheduler.schedule(when, self._async_show_next)
+
+    def advance(self, when: float) -> None:
+        """Show the next page at event loop time when instead of after the dwell."""
+        if self._cancelled or self._finished:
+            return
+        if self._showing:
+            self._advance_at = when
+        elif self._job is not None:
+            self._job.cancel()
+            self._job = self._scheduler.schedule(when, self._async_show_next)
+
+    def cancel(self) -> bool:
+        """Stop showing pages and drop a pending blank.
+
+        Returns True when pages were still being shown.
+        """
+        was_showing = not (self._cancelled or self._finished)
+        self._cancelled = True
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+        return was_showing
+
+    async def _async_show_next(self, when: float) -> None:
+        if self._cancelled:
+            return
+        if self._expires_at is not None and when >= self._expires_at:
+            _LOGGER.debug("Message for %s expired before all pages were shown", self._name)
+            self._finish(when)
+            return
+
+        start = time.perf_counter()
+        entry = next(self._iterator, None)
+        if entry is None and self._repeats_left > 0:
+            self._repeats_left -= 1
+            self._iterator = iter(self._pages)
+            self._index = 0
+            entry = next(self._iterator, None)
+        if self._on_layout is not None:
+            self._on_layout(time.perf_counter() - start)
+        if entry is None:
+            self._finish(when)
+            return
+        self._index += 1
+        if self._on_page is not None:
+            self._on_page()
+
+        self._showing = True
+        self._advance_at = None
+        try:
+            dwell = await self._show(*entry)
+        except Exception as e:
+            _LOGGER.error("Error displaying pages for %s: %s", self._name, e, exc_info=True)
+            self._finish(when)
+            return
+        finally:
+            self._showing = False
+        if not self._cancelled:
+            if self._advance_at is not None:
+                next_at = self._advance_at
+            elif entry[1] is None:
+                # After a slow publish the scroll carries on from now instead
+                # of sending every overdue step at once.
+                next_at = max(when + dwell, asyncio.get_running_loop().time())
+            else:
+                next_at = when + dwell
+            self._job = self._scheduler.schedule(next_at, self._async_show_next)
+
+    async def _async_blank(self, when: float) -> None:
+        self._job = None
+        if not self._cancelled:
+            await self._blank()
+
+    def _finish(self, when: float) -> None:
+        if self._cancelled:
+            return
+        self._finished = True
+        self._job = None
+        if self._blank_timer > 0:
+            self._job = self._scheduler.schedule(when + self._blank_timer, self._async_blank)
+        if self._on_done is not None:
+            self._on_done(when)
+
+
+def display_pages(
     hass: HomeAssistant,
-    config_entry: ConfigEntry,
-    pages: List[str],
-    delay: int,
+    config_entry: SplitflapConfigEntry,
+    pages: Iterable[str],
+    delay: Optional[int],
     repeat: int,
     blank_timer: int,
-):
-    """Coroutine to display pages with delays, repeats, and a final blanking timer."""
-    topic = config_entry.data[CONF_MQTT_TOPIC]
-    entry_id = config_entry.entry_id
-    entry_data = hass.data[DOMAIN][entry_id]
+    expires_at: Optional[float] = None,
+    on_done: Optional[Callable[[float], None]] = None,
+    when: Optional[float] = None,
+    skip: int = 0,
+    on_page: Optional[Callable[[], None]] = None,
+) -> PagePlayback:
+    """Start showing pages on a display with delays, repeats and a final blanking timer.
 
-    try:
-        for _ in range(repeat + 1):
-            for page in pages:
-                await mqtt.async_publish(hass, topic, page, retain=True)
-                await asyncio.sleep(delay)
-
-        if blank_timer > 0:
-            async def scheduled_blank():
-                await asyncio.sleep(blank_timer)
-                await blank_display(hass, config_entry)
-            
-            entry_data["blank_task"] = asyncio.create_task(scheduled_blank())
-
-    except asyncio.CancelledError:
-        _LOGGER.info("Display task for %s was cancelled.", config_entry.title)
-    finally:
-        entry_data["display_task"] = None
\ No newline at end of file
+    pages may be a Playlist, whose own delays replace delay. When the display
+    reports settling on its state topic, a page's delay is reading time
+    after the report, and the usual dwell is only the fallback should no
+    report arrive. on_page is called as each page is started.
+    """
+    data = config_entry.runtime_data
+    settle_tracker = data.settle_tracker
+    if not isinstance(pages, Playlist):
+        pages = Playlist(((pages, delay, 0),))
+
+    async def show(page: str, delay: Optional[float]) -> float:
+        previous = data.last_frame
+        # The frame shown is the page with any row regions laid over it.
+        frame = page if data.row_regions is None else data.row_regions.compose(page)
+        if settle_tracker is not None:
+            reading = 0.0 if delay is None else delay
+            settle_tracker.expect(frame, lambda settled_at: playback.advance(settled_at + reading))
+        try:
+            changed = await async_publish_frame(hass, config_entry, page)
+        except Exception:
+            if settle_tracker is not None:
+                settle_tracker.cancel()
+            raise
+        if not changed and settle_tracker is not None:
+            settle_tracker.cancel()
+        return get_page_dwell(data.settings, previous, frame, delay, data.stats.publish_latency)
+
+    playback = PagePlayback(
+        get_scheduler(hass),
+        config_entry.title,
+        pages,
+        repeat,
+        blank_timer,
+        show,
+        lambda: blank_display(hass, config_entry),
+        expires_at,
+        on_done,
+        data.stats.record_layout_slice,
+        on_page,
+    )
+    playback.start(hass.loop.time() if when is None else when, skip)
+    return playback
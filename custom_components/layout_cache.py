@@ -0,0 +1,53 @@
+"""Bounded LRU cache of laid out pages for the Splitflap integration."""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class LayoutCache:
+    """Keep the most recently used page lists, evicting the oldest when full."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize an empty cache holding at most max_size entries."""
+        self._max_size = max_size
+        self._pages: "OrderedDict[Hashable, Tuple[str, ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._pages)
+
+    def get(self, key: Hashable) -> Optional[Tuple[str, ...]]:
+        """Return the cached pages for key, or None on a miss."""
+        pages = self._pages.get(key)
+        if pages is None:
+            self.misses += 1
+            return None
+        self._pages.move_to_end(key)
+        self.hits += 1
+        return pages
+
+    def put(self, key: Hashable, pages: Tuple[str, ...]) -> None:
+        """Store pages for key, evicting the least recently used entry if needed."""
+        if self._max_size <= 0:
+            return
+        self._pages[key] = pages
+        self._pages.move_to_end(key)
+        while len(self._pages) > self._max_size:
+            self._pages.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached pages; counters are kept."""
+        self._pages.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for diagnostics."""
+        return {
+            "size": len(self._pages),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -54,6 +54,7 @@ class SplitflapNumberBase(SplitflapEntity, NumberEntity):
         self.hass.config_entries.async_update_entry(
             self.config_entry, options=new_options
         )
+        self.async_write_ha_state()
 
 
 class BlankTimerNumber(SplitflapNumberBase):
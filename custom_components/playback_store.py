@@ -0,0 +1,125 @@
+"""Persistence of the message a display is showing, across restarts."""
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CONF_FLAP_ALPHABET,
+    CONF_NUM_MODULES,
+    CONF_NUM_ROWS,
+    DOMAIN,
+    STORAGE_VERSION,
+    STORE_SAVE_DELAY,
+)
+from .display_queue import DisplayQueue, QueuedMessage
+from .helpers import Playlist
+from .runtime import SplitflapConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _geometry(config_entry: SplitflapConfigEntry) -> Dict[str, Any]:
+    """Return the settings stored pages were laid out for."""
+    settings = config_entry.runtime_data.settings
+    return {
+        CONF_NUM_MODULES: settings.num_modules,
+        CONF_NUM_ROWS: settings.num_rows,
+        CONF_FLAP_ALPHABET: settings.flap_alphabet,
+    }
+
+
+def _items(message: QueuedMessage) -> Optional[List[list]]:
+    """Return a message's pages as stored items, or None if they are laid out lazily."""
+    pages = message.pages
+    items = pages.items if isinstance(pages, Playlist) else ((pages, message.delay, 0),)
+    if not all(isinstance(item_pages, tuple) for item_pages, _, _ in items):
+        return None
+    return [[list(item_pages), delay, repeat] for item_pages, delay, repeat in items]
+
+
+class PlaybackStore:
+    """Keep the laid out pages of the message being shown, and how far it got.
+
+    Writes are debounced by the Store and made when Home Assistant stops, so
+    a rotation resumes after a restart without laying it out again. Pages
+    stored for another geometry or flap alphabet are discarded.
+    """
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize the store for a config entry."""
+        self._hass = hass
+        self._config_entry = config_entry
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}.playback"
+        )
+
+    @callback
+    def async_save_later(self, queue: DisplayQueue) -> None:
+        """Save the queue's current message after a delay."""
+        self._store.async_delay_save(lambda: self._data(queue), STORE_SAVE_DELAY)
+
+    async def async_save(self, queue: DisplayQueue) -> None:
+        """Save the queue's current message now."""
+        await self._store.async_save(self._data(queue))
+
+    async def async_load(self) -> Optional[Tuple[QueuedMessage, int]]:
+        """Return the stored message and the page to resume from, if still valid."""
+        data = await self._store.async_load()
+        if not data:
+            return None
+        if data.get("geometry") != _geometry(self._config_entry):
+            _LOGGER.debug("Discarding stored pages for %s laid out for other settings", self._config_entry.title)
+            return None
+
+        expires_at = None
+        if data["expires"] is not None:
+            remaining = data["expires"] - time.time()
+            if remaining <= 0:
+                return None
+            expires_at = self._hass.loop.time() + remaining
+
+        playlist = Playlist(
+            [(tuple(pages), delay, repeat) for pages, delay, repeat in data["items"]]
+        )
+        message = QueuedMessage(
+            playlist,
+            None,
+            data["repeat"],
+            data["blank_timer"],
+            priority=data["priority"],
+            expires_at=expires_at,
+            coalesce_key=data["coalesce_key"],
+        )
+        return message, data["position"]
+
+    async def async_remove(self) -> None:
+        """Delete the stored message."""
+        await self._store.async_remove()
+
+    def _data(self, queue: DisplayQueue) -> Dict[str, Any]:
+        message = queue.current
+        playback = queue.playback
+        if message is None or playback is None or playback.finished:
+            return {}
+        items = _items(message)
+        if items is None:
+            return {}
+
+        repeats_left, started = playback.position
+        expires = None
+        if message.expires_at is not None:
+            expires = time.time() + message.expires_at - self._hass.loop.time()
+        return {
+            "geometry": _geometry(self._config_entry),
+            "items": items,
+            "repeat": repeats_left,
+            # The page being shown is shown again, for its full dwell.
+            "position": max(started - 1, 0),
+            "blank_timer": message.blank_timer,
+            "priority": message.priority,
+            "coalesce_key": message.coalesce_key,
+            "expires": expires,
+        }
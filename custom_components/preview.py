@@ -0,0 +1,104 @@
+"""Layout previews for the Splitflap integration."""
+import asyncio
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import OVERFLOW_SCROLL, PREVIEW_CHUNK_SIZE, PREVIEW_EXECUTOR_MIN_CHARS, PREVIEW_MAX_PAGES
+from .helpers import Playlist, ScrollFrames, get_page_dwell, iter_canvas_layouts
+from .runtime import DisplaySettings
+from .text_processing import fit_to_rows
+
+
+def preview_text(
+    text: str,
+    settings: DisplaySettings,
+    overflow_type: str,
+    center: bool,
+    delay: int,
+    repeat: int,
+    previous: Optional[str] = None,
+    latency: float = 0.0,
+) -> Dict[str, Any]:
+    """Lay out text as the display would and describe the result.
+
+    Pages are returned as lists of rows, at most PREVIEW_MAX_PAGES of them,
+    with whether each was centered. The duration is the time the pages
+    would stay up from previous, the frame shown now, including repeats
+    and flap travel pacing but not blanking or settle reports.
+    """
+    width = settings.num_modules
+    if overflow_type == OVERFLOW_SCROLL:
+        pages: Iterable[str] = ScrollFrames(
+            text, width, settings.num_rows, center, settings.flap_alphabet
+        )
+        centered: Optional[List[bool]] = None
+    else:
+        rows = fit_to_rows(text, width, overflow_type, settings.flap_alphabet)
+        layouts = list(iter_canvas_layouts(rows, width, settings.num_rows, center))
+        pages = [page for page, _ in layouts]
+        centered = [page_centered for _, page_centered in layouts]
+
+    # Scrolls can run to many thousands of frames, so they are gone through
+    # once and only the pages returned are kept.
+    kept: List[str] = []
+    page_count = 0
+    duration = 0.0
+    first: Optional[Tuple[str, Optional[float]]] = None
+    last = previous
+    for page, page_delay in Playlist(((pages, delay, 0),)):
+        dwell = get_page_dwell(settings, last, page, page_delay, latency)
+        if first is None:
+            first = page, page_delay
+            first_dwell = dwell
+        duration += dwell
+        last = page
+        page_count += 1
+        if len(kept) < PREVIEW_MAX_PAGES:
+            kept.append(page)
+    if first is not None and repeat:
+        # A repeat differs from the first pass only in the page before its first.
+        repeat_dwell = get_page_dwell(settings, last, first[0], first[1], latency)
+        duration += repeat * (duration - first_dwell + repeat_dwell)
+
+    if centered is None:
+        # Only text that fits the row is not scrolled, and so can be centered.
+        centered = [center and page_count == 1 and bool(text.strip())] * len(kept)
+
+    return {
+        "text": text,
+        "page_count": page_count,
+        "pages": [[page[start:start + width] for start in range(0, len(page), width)] for page in kept],
+        "centered": centered[:PREVIEW_MAX_PAGES],
+        "truncated": page_count > PREVIEW_MAX_PAGES,
+        "estimated_duration": round(duration, 3),
+    }
+
+
+def preview_texts(texts: Sequence[str], settings: DisplaySettings, **kwargs: Any) -> List[Dict[str, Any]]:
+    """Preview every text with the same options, in order."""
+    return [preview_text(text, settings, **kwargs) for text in texts]
+
+
+async def async_preview_texts(
+    hass: HomeAssistant, texts: Sequence[str], settings: DisplaySettings, **kwargs: Any
+) -> List[Dict[str, Any]]:
+    """Preview texts, laying out large batches in the executor.
+
+    A batch of PREVIEW_EXECUTOR_MIN_CHARS or more is split into chunks of
+    PREVIEW_CHUNK_SIZE texts that are laid out in parallel jobs, so the event
+    loop is not held up however many texts there are.
+    """
+    if sum(map(len, texts)) < PREVIEW_EXECUTOR_MIN_CHARS:
+        return preview_texts(texts, settings, **kwargs)
+
+    chunks = await asyncio.gather(
+        *(
+            hass.async_add_executor_job(
+                partial(preview_texts, texts[start:start + PREVIEW_CHUNK_SIZE], settings, **kwargs)
+            )
+            for start in range(0, len(texts), PREVIEW_CHUNK_SIZE)
+        )
+    )
+    return [preview for chunk in chunks for preview in chunk]
@@ -0,0 +1,135 @@
+"""Row regions: rows of a Splitflap display showing messages of their own."""
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .helpers import PagePlayback, Playlist, async_publish_frame, get_page_dwell
+from .runtime import SplitflapConfigEntry
+from .scheduler import get_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RowError(HomeAssistantError):
+    """Raised when a message is sent to a row the display does not have."""
+
+
+class RowRegions:
+    """Rows of a display taken over by messages of their own.
+
+    Each region pages through its message on its own scheduler jobs, so a
+    row update lays out only that row and neither interrupts the other rows
+    nor the message on the whole display. Every frame published is the whole
+    display's frame, the base, with each region's current row laid over it.
+    """
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize with every row showing the base frame."""
+        self._hass = hass
+        self._config_entry = config_entry
+        self._rows: Dict[int, str] = {}
+        self._playbacks: Dict[int, PagePlayback] = {}
+        self._base_frame: Optional[str] = None
+        self.updates = 0
+
+    def check_row(self, row: int) -> None:
+        """Raise RowError unless row, counted from 1, is on the display."""
+        num_rows = self._config_entry.runtime_data.settings.num_rows
+        if not 1 <= row <= num_rows:
+            raise RowError(f"{self._config_entry.title} has {num_rows} rows, there is no row {row}")
+
+    def compose(self, frame: str, update_base: bool = False) -> str:
+        """Return frame with the regions' rows laid over it.
+
+        With update_base, frame is also kept as the base that later row
+        updates are laid over.
+        """
+        if update_base:
+            self._base_frame = frame
+        width = self._config_entry.runtime_data.settings.num_modules
+        for row, content in self._rows.items():
+            start = row * width
+            frame = frame[:start] + content + frame[start + width:]
+        return frame
+
+    @callback
+    def show(
+        self,
+        row: int,
+        pages: Iterable[str],
+        delay: int,
+        repeat: int,
+        blank_timer: int,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """Show pages of a single row on row, counted from 0, replacing its last message.
+
+        The row keeps its last page once every page was shown, unless
+        blank_timer hands it back to the base frame that many seconds later.
+        """
+        current = self._playbacks.pop(row, None)
+        if current is not None:
+            current.cancel()
+        data = self._config_entry.runtime_data
+        if self._base_frame is None:
+            # Nothing was published since setup, so the base is what is shown.
+            self._base_frame = data.last_frame or data.settings.blank_frame
+        self.updates += 1
+
+        async def show_page(page: str, delay: Optional[float]) -> float:
+            if self._playbacks.get(row) is not playback:
+                return 0.0
+            previous = data.last_frame
+            self._rows[row] = page
+            base = self._base_frame
+            await async_publish_frame(self._hass, self._config_entry, base)
+            return get_page_dwell(
+                data.settings, previous, self.compose(base), delay, data.stats.publish_latency
+            )
+
+        async def release() -> None:
+            if self._playbacks.get(row) is playback:
+                await self.async_release(row)
+
+        playback = PagePlayback(
+            get_scheduler(self._hass),
+            f"{self._config_entry.title} row {row + 1}",
+            Playlist(((pages, delay, 0),)),
+            repeat,
+            blank_timer,
+            show_page,
+            release,
+            expires_at,
+            on_layout=data.stats.record_layout_slice,
+        )
+        self._playbacks[row] = playback
+        playback.start(self._hass.loop.time())
+
+    async def async_release(self, row: int) -> None:
+        """Stop row's message, counted from 0, and show the base frame's row again."""
+        playback = self._playbacks.pop(row, None)
+        if playback is not None:
+            playback.cancel()
+        if self._rows.pop(row, None) is None:
+            return
+        try:
+            await async_publish_frame(self._hass, self._config_entry, self._base_frame)
+        except Exception as e:
+            _LOGGER.error("Failed to release row %d of %s: %s", row + 1, self._config_entry.title, e)
+
+    @callback
+    def cancel(self) -> None:
+        """Stop every region's message, as when the entry unloads."""
+        for playback in self._playbacks.values():
+            playback.cancel()
+        self._playbacks.clear()
+        self._rows.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the regions' rows, counted from 1, for diagnostics."""
+        return {
+            "rows": {row + 1: content for row, content in sorted(self._rows.items())},
+            "updates": self.updates,
+        }
@@ -0,0 +1,145 @@
+"""Per-entry runtime state for the Splitflap integration."""
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE
+
+from .charset import get_flap_positions
+from .const import (
+    CONF_BLANK_TIMER,
+    CONF_CENTER_TEXT,
+    CONF_COMMAND_BURST,
+    CONF_COMMAND_RATE_LIMIT,
+    CONF_COMMAND_TOPIC,
+    CONF_DELAY_BETWEEN_PAGES,
+    CONF_FLAP_ALPHABET,
+    CONF_FLAP_STEP_TIME,
+    CONF_GROUP,
+    CONF_GROUP_POSITION,
+    CONF_MQTT_TOPIC,
+    CONF_NUM_MODULES,
+    CONF_NUM_ROWS,
+    CONF_OVERFLOW_TYPE,
+    CONF_PACING,
+    CONF_PAYLOAD_FORMAT,
+    CONF_REPEAT_MULTIPAGE,
+    CONF_STATE_TOPIC,
+    DEFAULT_BLANK_TIMER,
+    DEFAULT_CENTER_TEXT,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_COMMAND_RATE_LIMIT,
+    DEFAULT_DELAY_BETWEEN_PAGES,
+    DEFAULT_FLAP_ALPHABET,
+    DEFAULT_FLAP_ORDER,
+    DEFAULT_FLAP_STEP_TIME,
+    DEFAULT_GROUP,
+    DEFAULT_GROUP_POSITION,
+    DEFAULT_OVERFLOW_TYPE,
+    DEFAULT_PACING,
+    DEFAULT_PAYLOAD_FORMAT,
+    DEFAULT_REPEAT_MULTIPAGE,
+)
+from .layout_cache import LayoutCache
+from .stats import DisplayStats
+
+if TYPE_CHECKING:
+    from .command_throttle import CommandThrottle
+    from .display_queue import DisplayQueue
+    from .group import GroupPlayback
+    from .regions import RowRegions
+    from .settle import SettleTracker
+    from .text import SplitflapText
+
+
+@dataclass(frozen=True)
+class DisplaySettings:
+    """An entry's data and options, resolved once with their defaults.
+
+    Message-level overrides use the same keys as the options, so a value is
+    looked up as overrides.get(CONF_CENTER_TEXT, settings.center_text).
+    """
+
+    mqtt_topic: str
+    command_topic: Optional[str]
+    state_topic: Optional[str]
+    num_modules: int
+    num_rows: int
+    center_text: bool
+    delay: int
+    repeat: int
+    overflow_type: str
+    blank_timer: int
+    flap_alphabet: str
+    flap_positions: Dict[str, int]
+    pacing: str
+    flap_step_time: float
+    payload_format: str
+    command_rate_limit: float
+    command_burst: int
+    group: str
+    group_position: int
+    blank_frame: str
+
+    @classmethod
+    def from_entry(cls, config_entry: ConfigEntry) -> "DisplaySettings":
+        """Resolve the settings of a config entry."""
+        data = config_entry.data
+        options = config_entry.options
+        num_modules = data[CONF_NUM_MODULES]
+        num_rows = data[CONF_NUM_ROWS]
+        flap_alphabet = options.get(CONF_FLAP_ALPHABET, DEFAULT_FLAP_ALPHABET)
+        return cls(
+            mqtt_topic=data[CONF_MQTT_TOPIC],
+            command_topic=data.get(CONF_COMMAND_TOPIC) or None,
+            state_topic=data.get(CONF_STATE_TOPIC) or None,
+            num_modules=num_modules,
+            num_rows=num_rows,
+            center_text=options.get(CONF_CENTER_TEXT, DEFAULT_CENTER_TEXT),
+            delay=options.get(CONF_DELAY_BETWEEN_PAGES, DEFAULT_DELAY_BETWEEN_PAGES),
+            repeat=options.get(CONF_REPEAT_MULTIPAGE, DEFAULT_REPEAT_MULTIPAGE),
+            overflow_type=options.get(CONF_OVERFLOW_TYPE, DEFAULT_OVERFLOW_TYPE),
+            blank_timer=options.get(CONF_BLANK_TIMER, DEFAULT_BLANK_TIMER),
+            flap_alphabet=flap_alphabet,
+            flap_positions=get_flap_positions(flap_alphabet or DEFAULT_FLAP_ORDER),
+            pacing=options.get(CONF_PACING, DEFAULT_PACING),
+            flap_step_time=options.get(CONF_FLAP_STEP_TIME, DEFAULT_FLAP_STEP_TIME),
+            payload_format=options.get(CONF_PAYLOAD_FORMAT, DEFAULT_PAYLOAD_FORMAT),
+            command_rate_limit=options.get(CONF_COMMAND_RATE_LIMIT, DEFAULT_COMMAND_RATE_LIMIT),
+            command_burst=options.get(CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST),
+            group=options.get(CONF_GROUP, DEFAULT_GROUP),
+            group_position=options.get(CONF_GROUP_POSITION, DEFAULT_GROUP_POSITION),
+            blank_frame=" " * (num_modules * num_rows),
+        )
+
+
+@dataclass(eq=False)
+class SplitflapData:
+    """State of a loaded entry, kept in its runtime_data.
+
+    settings is replaced whenever the entry's options change; everything
+    else lives as long as the entry is loaded.
+    """
+
+    settings: DisplaySettings
+    stats: DisplayStats
+    layout_cache: LayoutCache
+    queue: Optional["DisplayQueue"] = None
+    command_throttle: Optional["CommandThrottle"] = None
+    settle_tracker: Optional["SettleTracker"] = None
+    text_entity: Optional["SplitflapText"] = None
+    group_playback: Optional["GroupPlayback"] = None
+    group_layout: Optional[object] = None
+    row_regions: Optional["RowRegions"] = None
+    unsubscribe_mqtt: Optional[CALLBACK_TYPE] = None
+    unsub_keyframe: Optional[CALLBACK_TYPE] = None
+    last_frame: Optional[str] = None
+    restore_task: Optional[asyncio.Task] = None
+    last_modules_changed: int = 0
+    frames_published: int = 0
+    frames_suppressed: int = 0
+    frames_since_keyframe: int = 0
+
+
+SplitflapConfigEntry = ConfigEntry[SplitflapData]
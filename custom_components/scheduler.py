@@ -0,0 +1,189 @@
+"""Integration-wide deadline scheduler for the Splitflap integration."""
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_SCHEDULER
+
+_LOGGER = logging.getLogger(__name__)
+
+# Cancelled jobs are left in the heap until they outnumber the live ones.
+_COMPACT_MIN_CANCELLED = 64
+
+
+class ScheduledJob:
+    """An action due at an absolute event loop time."""
+
+    __slots__ = ("when", "action", "cancelled", "_scheduler", "_queued")
+
+    def __init__(
+        self,
+        scheduler: "DisplayScheduler",
+        when: float,
+        action: Callable[[float], Awaitable[None]],
+    ) -> None:
+        """Initialize a job; DisplayScheduler.schedule creates these."""
+        self.when = when
+        self.action = action
+        self.cancelled = False
+        self._scheduler = scheduler
+        self._queued = True
+
+    def cancel(self) -> None:
+        """Stop the job from running if it has not started yet."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self._queued:
+            self._scheduler._job_cancelled()
+
+
+class DisplayScheduler:
+    """Run page advances and blanking for every display from one task.
+
+    Jobs are kept in a heap ordered by their due time and run by a single
+    task that sleeps until the earliest one is due. An action receives the
+    time it was due, not the time it ran, so follow-up jobs scheduled from
+    it do not accumulate publish latency. The task exits when nothing is
+    scheduled.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty scheduler."""
+        self._hass = hass
+        self._heap: List[Tuple[float, int, ScheduledJob]] = []
+        self._sequence = itertools.count()
+        self._cancelled = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Tells a stopped task apart from the one that replaced it.
+        self._generation = 0
+        self.jobs_run = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+        self.last_lateness = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of jobs waiting to run."""
+        return len(self._heap) - self._cancelled
+
+    def schedule(
+        self, when: float, action: Callable[[float], Awaitable[None]]
+    ) -> ScheduledJob:
+        """Run action at event loop time when and return its job."""
+        job = ScheduledJob(self, when, action)
+        heapq.heappush(self._heap, (when, next(self._sequence), job))
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._run(self._generation), "splitflap display scheduler"
+            )
+        elif self._heap[0][2] is job:
+            self._wakeup.set()
+        return job
+
+    def cancel_all(self) -> None:
+        """Drop every scheduled job and stop the task."""
+        for _, _, job in self._heap:
+            job.cancelled = True
+            job._queued = False
+        self._heap.clear()
+        self._cancelled = 0
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            self._generation += 1
+
+    def stats(self) -> Dict[str, object]:
+        """Return scheduling counters for diagnostics."""
+        return {
+            "scheduled": len(self),
+            "jobs_run": self.jobs_run,
+            "mean_lateness": self.total_lateness / self.jobs_run if self.jobs_run else 0.0,
+            "max_lateness": self.max_lateness,
+            "last_lateness": self.last_lateness,
+        }
+
+    def _job_cancelled(self) -> None:
+        self._cancelled += 1
+        if self._cancelled >= _COMPACT_MIN_CANCELLED and self._cancelled * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def _pop_due(self, now: float) -> List[ScheduledJob]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            job = heapq.heappop(self._heap)[2]
+            job._queued = False
+            if job.cancelled:
+                self._cancelled -= 1
+            else:
+                due.append(job)
+        return due
+
+    async def _run(self, generation: int) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)[2]._queued = False
+                    self._cancelled -= 1
+                if not self._heap:
+                    return
+                when = self._heap[0][0]
+                now = loop.time()
+                if when > now:
+                    self._wakeup.clear()
+                    timer = loop.call_at(when, self._wakeup.set)
+                    try:
+                        await self._wakeup.wait()
+                    finally:
+                        timer.cancel()
+                    continue
+
+                due = self._pop_due(now)
+                for job in due:
+                    lateness = now - job.when
+                    self.jobs_run += 1
+                    self.total_lateness += lateness
+                    self.last_lateness = lateness
+                    if lateness > self.max_lateness:
+                        self.max_lateness = lateness
+                if len(due) == 1:
+                    # A lone due job, the common case, is awaited here instead of in a new task.
+                    results = [await _async_run_job(due[0])]
+                else:
+                    results = await asyncio.gather(*(_async_run_job(job) for job in due))
+                for result in results:
+                    if isinstance(result, Exception):
+                        _LOGGER.error("Scheduled display job failed: %s", result, exc_info=result)
+        finally:
+            if generation == self._generation:
+                self._task = None
+
+
+async def _async_run_job(job: ScheduledJob) -> Optional[Exception]:
+    """Run a job's action, returning rather than raising its error.
+
+    A job cancelled by another job due at the same time, after both were
+    taken off the heap, is skipped.
+    """
+    if job.cancelled:
+        return None
+    try:
+        await job.action(job.when)
+    except Exception as e:
+        return e
+    return None
+
+
+def get_scheduler(hass: HomeAssistant) -> DisplayScheduler:
+    """Return the scheduler shared by all splitflap entries."""
+    scheduler = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = DisplayScheduler(hass)
+    return scheduler
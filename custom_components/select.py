@@ -3,7 +3,15 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import CONF_OVERFLOW_TYPE, DOMAIN, OVERFLOW_TYPES, DEFAULT_OVERFLOW_TYPE
+from .const import (
+    CONF_OVERFLOW_TYPE,
+    CONF_PACING,
+    DOMAIN,
+    OVERFLOW_TYPES,
+    PACING_TYPES,
+    DEFAULT_OVERFLOW_TYPE,
+    DEFAULT_PACING,
+)
 from .entity import SplitflapEntity
 
 
@@ -13,7 +21,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Splitflap select entities."""
-    async_add_entities([OverflowSelect(config_entry)])
+    async_add_entities([OverflowSelect(config_entry), PacingSelect(config_entry)])
 
 
 class OverflowSelect(SplitflapEntity, SelectEntity):
@@ -37,4 +45,30 @@ class OverflowSelect(SplitflapEntity, SelectEntity):
         new_options[CONF_OVERFLOW_TYPE] = option
         self.hass.config_entries.async_update_entry(
             self.config_entry, options=new_options
-        )
\ No newline at end of file
+        )
+        self.async_write_ha_state()
+
+
+class PacingSelect(SplitflapEntity, SelectEntity):
+    """Representation of a select entity for the page pacing mode."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize the select entity."""
+        super().__init__(config_entry)
+        self._attr_name = f"{config_entry.title} Page Pacing"
+        self._attr_unique_id = f"{config_entry.entry_id}_pacing"
+        self._attr_options = PACING_TYPES
+
+    @property
+    def current_option(self) -> str:
+        """Return the selected entity option to represent the state."""
+        return self.config_entry.options.get(CONF_PACING, DEFAULT_PACING)
+
+    async def async_select_option(self, option: str) -> None:
+        """Update the page pacing mode."""
+        new_options = self.config_entry.options.copy()
+        new_options[CONF_PACING] = option
+        self.hass.config_entries.async_update_entry(
+            self.config_entry, options=new_options
+        )
+        self.async_write_ha_state()
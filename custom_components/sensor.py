@@ -0,0 +1,272 @@
+"""Diagnostic sensor entities for the Splitflap integration."""
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .entity import SplitflapEntity
+from .runtime import SplitflapConfigEntry, SplitflapData
+from .stats import DisplayStats, percentiles
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: SplitflapConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Splitflap diagnostic sensor entities."""
+    entities = [
+        LayoutTimeSensor(hass, config_entry),
+        LongestLayoutSliceSensor(hass, config_entry),
+        PublishLatencySensor(hass, config_entry),
+        PagesPublishedSensor(hass, config_entry),
+        BytesPublishedSensor(hass, config_entry),
+        BytesSavedSensor(hass, config_entry),
+        CancellationsSensor(hass, config_entry),
+        QueueDepthSensor(hass, config_entry),
+        LastMessageSensor(hass, config_entry),
+    ]
+    async_add_entities(entities)
+
+
+class SplitflapStatsSensorBase(SplitflapEntity, SensorEntity):
+    """Base class for sensors reporting the display pipeline counters.
+
+    They are disabled by default and only written when the entry's
+    DisplayStats notifies them, which it throttles.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = False
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry, key: str, name: str) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(config_entry)
+        self.hass = hass
+        self._attr_name = f"{config_entry.title} {name}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{key}"
+
+    @property
+    def _data(self) -> SplitflapData:
+        return self._config_entry.runtime_data
+
+    @property
+    def _stats(self) -> DisplayStats:
+        return self._data.stats
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the entry's counters."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._stats.async_add_listener(self._async_stats_updated))
+
+    @callback
+    def _async_stats_updated(self) -> None:
+        """Write the state with the latest counters."""
+        self.async_write_ha_state()
+
+
+class PercentileSensorBase(SplitflapStatsSensorBase):
+    """Sensor whose state is the median of a timing sample, in milliseconds.
+
+    The percentiles are worked out once each time the counters change, not
+    for every property the state is written from.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: SplitflapConfigEntry,
+        key: str,
+        name: str,
+        samples: Callable[[DisplayStats], Sequence[float]],
+    ) -> None:
+        """Initialize the sensor entity with the function returning its sample."""
+        super().__init__(hass, config_entry, key, name)
+        self._samples = samples
+        self._percentiles: Dict[str, Optional[float]] = percentiles(())
+        self._sample_count = 0
+
+    async def async_added_to_hass(self) -> None:
+        """Work out the percentiles of the samples taken so far."""
+        self._update_percentiles()
+        await super().async_added_to_hass()
+
+    @callback
+    def _async_stats_updated(self) -> None:
+        """Work out the percentiles again and write the state."""
+        self._update_percentiles()
+        super()._async_stats_updated()
+
+    def _update_percentiles(self) -> None:
+        samples = self._samples(self._stats)
+        self._percentiles = percentiles(samples)
+        self._sample_count = len(samples)
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the median."""
+        return self._percentiles["p50"]
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the other percentiles."""
+        return {**self._percentiles, "samples": self._sample_count}
+
+
+class LayoutTimeSensor(PercentileSensorBase):
+    """Sensor for how long messages take to lay out."""
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(
+            hass, config_entry, "layout_time", "Layout Time", lambda stats: stats.layout_times
+        )
+
+
+class LongestLayoutSliceSensor(SplitflapStatsSensorBase):
+    """Sensor for the longest layout step that held up the event loop."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(hass, config_entry, "longest_layout_slice", "Longest Layout Slice")
+
+    @property
+    def native_value(self) -> float:
+        """Return the longest layout step run on the event loop."""
+        return round(self._stats.longest_layout_slice * 1000, 3)
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the number of messages superseded while being laid out."""
+        return {"superseded": self._stats.superseded}
+
+
+class PublishLatencySensor(PercentileSensorBase):
+    """Sensor for how long frame publishes take."""
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(
+            hass, config_entry, "publish_latency", "Publish Latency", lambda stats: stats.publish_times
+        )
+
+
+class PagesPublishedSensor(SplitflapStatsSensorBase):
+    """Sensor for the number of frames published."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(hass, config_entry, "pages_published", "Pages Published")
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of frames published."""
+        return self._data.frames_published
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the number of unchanged frames that were not published."""
+        return {"suppressed": self._data.frames_suppressed}
+
+
+class BytesPublishedSensor(SplitflapStatsSensorBase):
+    """Sensor for the payload bytes published."""
+
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(hass, config_entry, "bytes_published", "Bytes Published")
+
+    @property
+    def native_value(self) -> int:
+        """Return the payload bytes published."""
+        return self._stats.bytes_published
+
+
+class BytesSavedSensor(SplitflapStatsSensorBase):
+    """Sensor for the payload bytes delta frames saved over full frames."""
+
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(hass, config_entry, "bytes_saved", "Bytes Saved")
+
+    @property
+    def native_value(self) -> int:
+        """Return the payload bytes saved."""
+        return self._stats.bytes_saved
+
+
+class CancellationsSensor(SplitflapStatsSensorBase):
+    """Sensor for messages cut off before all their pages were shown."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(hass, config_entry, "cancellations", "Cancelled Messages")
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of cancelled messages."""
+        return self._stats.cancellations
+
+
+class QueueDepthSensor(SplitflapStatsSensorBase):
+    """Sensor for the messages waiting for the display."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(hass, config_entry, "queue_depth", "Queue Depth")
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of waiting messages."""
+        return len(self._data.queue)
+
+
+class LastMessageSensor(SplitflapStatsSensorBase):
+    """Sensor for the most recent message, with the recent ones as an attribute."""
+
+    # The history is for diagnosis only and would bloat the recorder.
+    _unrecorded_attributes = frozenset({"recent_messages"})
+
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(hass, config_entry, "last_message", "Last Message")
+
+    @property
+    def native_value(self) -> Optional[str]:
+        """Return the text of the most recent message."""
+        recent = self._stats.recent_messages
+        return recent[-1]["text"] if recent else None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the recent messages, newest last."""
+        return {"recent_messages": list(self._stats.recent_messages)}
@@ -0,0 +1,112 @@
+"""Settle reports from the Splitflap display's state topic."""
+import json
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from homeassistant.components import mqtt
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import STATE_SETTLED, STATS_SAMPLE_SIZE
+from .stats import percentiles
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_settle_report(payload: Any) -> Tuple[bool, Optional[str]]:
+    """Return whether payload reports settled flaps and the frame it names, if any.
+
+    The display may send the bare word, or a JSON object whose "state" is
+    the word and whose optional "frame" is the frame it settled on.
+    """
+    if isinstance(payload, bytes):
+        payload = payload.decode(errors="replace")
+    payload = payload.strip()
+    if payload.lower() == STATE_SETTLED:
+        return True, None
+    try:
+        report = json.loads(payload)
+    except ValueError:
+        return False, None
+    if not isinstance(report, dict) or str(report.get("state", "")).lower() != STATE_SETTLED:
+        return False, None
+    frame = report.get("frame")
+    return True, frame if isinstance(frame, str) else None
+
+
+class SettleTracker:
+    """Wait for a display to report that its flaps settled on the last frame.
+
+    Only the most recently published frame is waited for. A report naming a
+    different frame is a late one for an earlier page and is ignored; a
+    report without a frame settles whatever was published last.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """Initialize a tracker that is not subscribed yet."""
+        self._hass = hass
+        self._name = name
+        self._frame: Optional[str] = None
+        self._published_at = 0.0
+        self._on_settled: Optional[Callable[[float], None]] = None
+        self._unsubscribe: Optional[CALLBACK_TYPE] = None
+        self.settle_times: Deque[float] = deque(maxlen=STATS_SAMPLE_SIZE)
+        self.reports = 0
+        self.timeouts = 0
+
+    async def async_start(self, topic: str) -> None:
+        """Subscribe to the display's state topic."""
+        self._unsubscribe = await mqtt.async_subscribe(self._hass, topic, self._message_received, 1)
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe and forget the frame being waited for."""
+        self.cancel()
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    @callback
+    def expect(self, frame: str, on_settled: Callable[[float], None]) -> None:
+        """Call on_settled with the event loop time once the display settles on frame.
+
+        Call this before publishing frame, so an immediate report is not
+        missed. A frame still waited for counts as a timeout.
+        """
+        if self._on_settled is not None:
+            self.timeouts += 1
+            _LOGGER.debug("No settle report from %s before the next page", self._name)
+        self._frame = frame
+        self._published_at = self._hass.loop.time()
+        self._on_settled = on_settled
+
+    @callback
+    def cancel(self) -> None:
+        """Stop waiting, for instance when the frame was not published."""
+        self._frame = None
+        self._on_settled = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return settle counters for diagnostics."""
+        return {
+            "reports": self.reports,
+            "timeouts": self.timeouts,
+            "settle_ms": percentiles(self.settle_times),
+        }
+
+    @callback
+    def _message_received(self, msg) -> None:
+        if msg.retain or self._on_settled is None:
+            return
+        settled, frame = parse_settle_report(msg.payload)
+        if not settled:
+            return
+        if frame is not None and frame != self._frame:
+            _LOGGER.debug("Ignoring settle report from %s for an earlier frame", self._name)
+            return
+        now = self._hass.loop.time()
+        on_settled = self._on_settled
+        self.cancel()
+        self.reports += 1
+        self.settle_times.append(now - self._published_at)
+        on_settled(now)
@@ -0,0 +1,150 @@
+"""Display pipeline instrumentation for the Splitflap integration."""
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    PUBLISH_LATENCY_SMOOTHING,
+    RECENT_MESSAGE_MAX_CHARS,
+    RECENT_MESSAGES_SIZE,
+    STATS_SAMPLE_SIZE,
+    STATS_UPDATE_INTERVAL,
+)
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentiles(samples: Iterable[float]) -> Dict[str, Optional[float]]:
+    """Return nearest-rank percentiles of samples in seconds, in milliseconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{q}": None for q in PERCENTILES}
+    last = len(ordered) - 1
+    return {
+        f"p{q}": round(ordered[min(last, (len(ordered) * q - 1) // 100)] * 1000, 3)
+        for q in PERCENTILES
+    }
+
+
+class DisplayStats:
+    """Timing and volume counters for one display.
+
+    Only the most recent samples are kept. Listeners, such as the diagnostic
+    sensors, are called at most once per update interval however busy the
+    display is, so the instrumentation does not flood the recorder.
+    """
+
+    def __init__(self, hass: HomeAssistant, update_interval: float = STATS_UPDATE_INTERVAL) -> None:
+        """Initialize empty counters."""
+        self._hass = hass
+        self._update_interval = update_interval
+        self._listeners: List[CALLBACK_TYPE] = []
+        self._last_update: Optional[float] = None
+        self._unsub_update: Optional[CALLBACK_TYPE] = None
+        self.layout_times: Deque[float] = deque(maxlen=STATS_SAMPLE_SIZE)
+        self.publish_times: Deque[float] = deque(maxlen=STATS_SAMPLE_SIZE)
+        self.recent_messages: Deque[Dict[str, Any]] = deque(maxlen=RECENT_MESSAGES_SIZE)
+        self.bytes_published = 0
+        self.bytes_saved = 0
+        self.cancellations = 0
+        self.superseded = 0
+        # Longest layout step run on the event loop, in seconds.
+        self.longest_layout_slice = 0.0
+        # Smoothed publish time in seconds, which paces scrolling.
+        self.publish_latency = 0.0
+
+    def record_layout(self, text: str, seconds: float, page_count: Optional[int]) -> None:
+        """Record a message being laid out; page_count is None for lazy layouts."""
+        self.layout_times.append(seconds)
+        self.recent_messages.append(
+            {
+                "text": text[:RECENT_MESSAGE_MAX_CHARS],
+                "pages": page_count,
+                "layout_ms": round(seconds * 1000, 3),
+                "received": dt_util.utcnow().isoformat(),
+            }
+        )
+        self.async_schedule_update()
+
+    def record_layout_slice(self, seconds: float) -> None:
+        """Record a layout step that ran on the event loop."""
+        if seconds > self.longest_layout_slice:
+            self.longest_layout_slice = seconds
+            self.async_schedule_update()
+
+    def record_superseded(self) -> None:
+        """Record a layout dropped because a newer message arrived while it ran."""
+        self.superseded += 1
+        self.async_schedule_update()
+
+    def record_publish(self, seconds: float, size: int, saved: int = 0) -> None:
+        """Record a frame publish of size bytes, saved fewer than the full frame."""
+        if self.publish_times:
+            self.publish_latency += (seconds - self.publish_latency) * PUBLISH_LATENCY_SMOOTHING
+        else:
+            self.publish_latency = seconds
+        self.publish_times.append(seconds)
+        self.bytes_published += size
+        self.bytes_saved += saved
+        self.async_schedule_update()
+
+    def record_cancellation(self) -> None:
+        """Record a message being cut off before all its pages were shown."""
+        self.cancellations += 1
+        self.async_schedule_update()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback when the counters change, throttled."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop a pending listener update."""
+        if self._unsub_update is not None:
+            self._unsub_update()
+            self._unsub_update = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "layout_ms": percentiles(self.layout_times),
+            "publish_ms": percentiles(self.publish_times),
+            "publish_latency_ms": round(self.publish_latency * 1000, 3),
+            "bytes_published": self.bytes_published,
+            "bytes_saved": self.bytes_saved,
+            "cancellations": self.cancellations,
+            "superseded": self.superseded,
+            "longest_layout_slice_ms": round(self.longest_layout_slice * 1000, 3),
+            "recent_messages": list(self.recent_messages),
+        }
+
+    @callback
+    def async_schedule_update(self) -> None:
+        """Notify listeners of a change, at most once per update interval."""
+        if not self._listeners or self._unsub_update is not None:
+            return
+        if self._last_update is None:
+            self._async_update(None)
+            return
+        wait = self._last_update + self._update_interval - self._hass.loop.time()
+        if wait <= 0:
+            self._async_update(None)
+        else:
+            self._unsub_update = async_call_later(self._hass, wait, self._async_update)
+
+    @callback
+    def _async_update(self, _now: Any) -> None:
+        self._unsub_update = None
+        self._last_update = self._hass.loop.time()
+        for update_callback in list(self._listeners):
+            update_callback()
@@ -38,6 +38,7 @@ class CenterTextSwitch(SplitflapEntity, SwitchEntity):
         self.hass.config_entries.async_update_entry(
             self.config_entry, options=new_options
         )
+        self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the entity on."""
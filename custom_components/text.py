@@ -1,91 +1,583 @@
 """Support for Splitflap text."""
-import asyncio
 import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import voluptuous as vol
 
 from homeassistant.components.text import TextEntity
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    TrackTemplateResult,
+    TrackTemplateResultInfo,
+    async_track_template_result,
+)
+from homeassistant.helpers.restore_state import RestoredExtraData, RestoreEntity
+from homeassistant.helpers.template import Template
 
 from .const import (
+    ATTR_COALESCE_KEY,
+    ATTR_MESSAGES,
+    ATTR_PRIORITY,
+    ATTR_ROW,
+    ATTR_TEMPLATE,
+    ATTR_TEXT,
+    ATTR_TEXTS,
+    ATTR_TTL,
     CONF_BLANK_TIMER,
     CONF_CENTER_TEXT,
     CONF_DELAY_BETWEEN_PAGES,
     CONF_OVERFLOW_TYPE,
     CONF_REPEAT_MULTIPAGE,
-    DEFAULT_BLANK_TIMER,
-    DEFAULT_CENTER_TEXT,
-    DEFAULT_DELAY_BETWEEN_PAGES,
-    DEFAULT_OVERFLOW_TYPE,
-    DEFAULT_REPEAT_MULTIPAGE,
     DOMAIN,
+    OVERFLOW_SCROLL,
+    OVERFLOW_TYPES,
+    SERVICE_DISPLAY_TEXT,
+    SERVICE_PREVIEW_LAYOUT,
+    TEMPLATE_COALESCE_KEY,
+    TEMPLATE_RATE_LIMIT,
 )
+from .display_queue import QueuedMessage
 from .entity import SplitflapEntity
 from .helpers import (
-    _async_display_pages,
+    Playlist,
+    async_layout_pages,
+    async_restore_last_frame,
     blank_display,
-    create_pages,
-    get_config_value,
+    iter_canvas_pages,
+    layout_blocks_loop,
+    layout_pages,
 )
-from .text_processing import fit_to_rows
+from .preview import async_preview_texts
+from .regions import RowError
+from .runtime import SplitflapConfigEntry
+from .text_processing import RowLayout
 
 _LOGGER = logging.getLogger(__name__)
 
+MESSAGE_OPTIONS_SCHEMA = {
+    vol.Optional(CONF_OVERFLOW_TYPE): vol.In(OVERFLOW_TYPES),
+    vol.Optional(CONF_CENTER_TEXT): cv.boolean,
+    vol.Optional(CONF_DELAY_BETWEEN_PAGES): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional(CONF_REPEAT_MULTIPAGE): vol.All(vol.Coerce(int), vol.Range(min=0)),
+}
+DISPLAY_OPTIONS_SCHEMA = {
+    **MESSAGE_OPTIONS_SCHEMA,
+    vol.Optional(CONF_BLANK_TIMER): vol.All(vol.Coerce(int), vol.Range(min=0)),
+}
+# A playlist item is a message with its own options, or just its text.
+PLAYLIST_ITEM_SCHEMA = vol.Any(
+    vol.Schema({vol.Required(ATTR_TEXT): cv.string, **MESSAGE_OPTIONS_SCHEMA}),
+    vol.All(cv.string, lambda text: {ATTR_TEXT: text}),
+)
+DISPLAY_TEXT_SCHEMA = {
+    vol.Optional(ATTR_TEXT): cv.string,
+    vol.Optional(ATTR_ROW): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(ATTR_MESSAGES): vol.All(cv.ensure_list, [PLAYLIST_ITEM_SCHEMA], vol.Length(min=1)),
+    vol.Optional(ATTR_TEMPLATE): cv.string,
+    **DISPLAY_OPTIONS_SCHEMA,
+    vol.Optional(ATTR_PRIORITY): vol.Coerce(int),
+    vol.Optional(ATTR_TTL): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(ATTR_COALESCE_KEY): cv.string,
+}
+
+
+def _row_needs_text(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Allow a row only with a text, since playlists and templates take the whole display."""
+    if ATTR_ROW in data and (ATTR_TEXT not in data or ATTR_MESSAGES in data or ATTR_TEMPLATE in data):
+        raise vol.Invalid("A row can only be given with a text")
+    return data
+
+
+PREVIEW_LAYOUT_SCHEMA = {
+    vol.Required(ATTR_TEXTS): vol.All(cv.ensure_list, [cv.string], vol.Length(min=1)),
+    **MESSAGE_OPTIONS_SCHEMA,
+}
+COMMAND_SCHEMA = vol.All(
+    vol.Schema(DISPLAY_TEXT_SCHEMA),
+    cv.has_at_least_one_key(ATTR_TEXT, ATTR_MESSAGES, ATTR_TEMPLATE),
+    _row_needs_text,
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
-    config_entry: ConfigEntry,
+    config_entry: SplitflapConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Splitflap text platform."""
     async_add_entities([SplitflapText(hass, config_entry)])
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_DISPLAY_TEXT,
+        vol.All(
+            cv.make_entity_service_schema(DISPLAY_TEXT_SCHEMA),
+            cv.has_at_least_one_key(ATTR_TEXT, ATTR_MESSAGES, ATTR_TEMPLATE),
+            _row_needs_text,
+        ),
+        "async_display_text",
+    )
+    platform.async_register_entity_service(
+        SERVICE_PREVIEW_LAYOUT,
+        cv.make_entity_service_schema(PREVIEW_LAYOUT_SCHEMA),
+        "async_preview_layout",
+        supports_response=SupportsResponse.ONLY,
+    )
+
 
-class SplitflapText(SplitflapEntity, TextEntity):
+class SplitflapText(SplitflapEntity, TextEntity, RestoreEntity):
     """Representation of a Splitflap text entity."""
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    def __init__(self, hass: HomeAssistant, config_entry: SplitflapConfigEntry) -> None:
         """Initialize the text entity."""
         super().__init__(config_entry)
         self.hass = hass
         self._attr_name = f"{config_entry.title} Text"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_text"
         self._state = ""
+        self._template_info: Optional[TrackTemplateResultInfo] = None
+        self._row_layout: Optional[RowLayout] = None
+        # Bumped by every message, so a layout still running when the next
+        # one arrives knows it was superseded. Rows count their own messages.
+        self._layout_generation = 0
+        self._row_generations: Dict[int, int] = {}
 
     @property
     def native_value(self) -> str:
         """Return the native value of the text entity."""
         return self._state
 
-    async def async_set_value(self, value: str, **kwargs) -> None:
-        """Set new value and begin display process."""
+    @property
+    def extra_restore_state_data(self) -> RestoredExtraData:
+        """Return the last published frame to restore with the value."""
+        return RestoredExtraData({"last_frame": self._config_entry.runtime_data.last_frame})
+
+    @callback
+    def _async_set_state(self, value: str) -> None:
+        """Make value the entity's state, cut to the longest state a text entity allows.
+
+        Messages may be far longer than a state can be, so only their start
+        is kept; the whole message is still laid out and shown.
+        """
+        if len(value) > self.native_max:
+            value = value[: self.native_max - 1] + "…"
         self._state = value
         self.async_write_ha_state()
 
-        entry_id = self._config_entry.entry_id
-        entry_data = self.hass.data[DOMAIN][entry_id]
+    async def async_added_to_hass(self) -> None:
+        """Restore the last value and frame, and register with the entry.
 
-        if entry_data.get("display_task"):
-            entry_data["display_task"].cancel()
-        if entry_data.get("blank_task"):
-            entry_data["blank_task"].cancel()
+        Registering lets command payloads reach the entity directly. When the
+        display topic still retains the restored frame it is taken as shown,
+        so re-sending the same message after a restart publishes nothing.
+        Waiting for the retained frame does not hold up setup; the first
+        publish waits for it instead.
+        """
+        await super().async_added_to_hass()
+        data = self._config_entry.runtime_data
+        data.text_entity = self
 
-        if not value or not value.strip():
+        last_state = await self.async_get_last_state()
+        if last_state is not None and last_state.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._state = last_state.state
+        last_extra_data = await self.async_get_last_extra_data()
+        if last_extra_data is None:
+            return
+        last_frame = last_extra_data.as_dict().get("last_frame")
+        if last_frame and data.last_frame is None:
+            data.restore_task = self.hass.async_create_background_task(
+                self._async_restore_last_frame(last_frame),
+                f"splitflap restore frame {self._config_entry.title}",
+            )
+
+    async def _async_restore_last_frame(self, frame: str) -> None:
+        try:
+            await async_restore_last_frame(self.hass, self._config_entry, frame)
+        except Exception as e:
+            _LOGGER.warning("Could not check the retained frame for %s: %s", self._config_entry.title, e)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unregister from the entry."""
+        data = self._config_entry.runtime_data
+        if data.text_entity is self:
+            data.text_entity = None
+        if data.restore_task is not None:
+            data.restore_task.cancel()
+            data.restore_task = None
+        self._async_stop_template()
+        await super().async_will_remove_from_hass()
+
+    async def async_set_value(self, value: str, **kwargs) -> None:
+        """Set new value and begin display process."""
+        self._async_stop_template()
+        if not await self._async_queue_value(value, **kwargs):
             await blank_display(self.hass, self._config_entry)
+
+    async def async_display_text(self, **kwargs) -> None:
+        """Handle the display_text service with per-message options."""
+        row = kwargs.pop(ATTR_ROW, None)
+        if row is not None:
+            self._config_entry.runtime_data.row_regions.check_row(row)
+            await self._async_show_row(row, kwargs.pop(ATTR_TEXT), **kwargs)
+            return
+        template = kwargs.pop(ATTR_TEMPLATE, None)
+        if template is not None:
+            self._async_track_template(template, kwargs)
+            return
+        messages = kwargs.pop(ATTR_MESSAGES, None)
+        if messages is not None:
+            self._async_stop_template()
+            await self._async_queue_playlist(messages, **kwargs)
+            return
+        await self.async_set_value(kwargs.pop(ATTR_TEXT), **kwargs)
+
+    async def async_preview_layout(self, **kwargs) -> ServiceResponse:
+        """Lay out texts as they would be shown, without showing them."""
+        data = self._config_entry.runtime_data
+        settings = data.settings
+        previews = await async_preview_texts(
+            self.hass,
+            kwargs[ATTR_TEXTS],
+            settings,
+            overflow_type=kwargs.get(CONF_OVERFLOW_TYPE, settings.overflow_type),
+            center=kwargs.get(CONF_CENTER_TEXT, settings.center_text),
+            delay=kwargs.get(CONF_DELAY_BETWEEN_PAGES, settings.delay),
+            repeat=kwargs.get(CONF_REPEAT_MULTIPAGE, settings.repeat),
+            previous=data.last_frame,
+            latency=data.stats.publish_latency,
+        )
+        return {"previews": previews}
+
+    @callback
+    def async_handle_command(self, payload: Dict[str, Any]) -> None:
+        """Display a command topic payload without a service call.
+
+        Long messages are laid out in the executor, so a payload is shown
+        from a task rather than before this returns.
+        """
+        try:
+            data = COMMAND_SCHEMA(payload)
+        except vol.Invalid as e:
+            _LOGGER.warning("Invalid command payload for %s: %s", self._config_entry.title, e)
+            return
+        row = data.pop(ATTR_ROW, None)
+        if row is not None:
+            try:
+                self._config_entry.runtime_data.row_regions.check_row(row)
+            except RowError as e:
+                _LOGGER.warning("Invalid command payload for %s: %s", self._config_entry.title, e)
+                return
+            self.hass.async_create_task(self._async_show_row(row, data.pop(ATTR_TEXT), **data))
+            return
+        template = data.pop(ATTR_TEMPLATE, None)
+        if template is not None:
+            self._async_track_template(template, data)
+            return
+        self._async_stop_template()
+        messages = data.pop(ATTR_MESSAGES, None)
+        if messages is not None:
+            self.hass.async_create_task(self._async_queue_playlist(messages, **data))
+            return
+        self.hass.async_create_task(self.async_set_value(data.pop(ATTR_TEXT), **data))
+
+    @callback
+    def _async_track_template(self, template: str, kwargs: Dict[str, Any]) -> None:
+        """Show template, and show it again when the entities it uses change.
+
+        Renders are rate limited and replace the template's earlier message
+        in the queue. Only the rows from shortly before the first change in
+        the rendered text are fitted again.
+        """
+        self._async_stop_template()
+        settings = self._config_entry.runtime_data.settings
+        overflow_type = kwargs.get(CONF_OVERFLOW_TYPE, settings.overflow_type)
+        # Scrolling messages are not fitted to rows at all.
+        if overflow_type != OVERFLOW_SCROLL:
+            self._row_layout = RowLayout(settings.num_modules, overflow_type, settings.flap_alphabet)
+        kwargs = {ATTR_COALESCE_KEY: TEMPLATE_COALESCE_KEY, **kwargs}
+
+        @callback
+        def _async_template_rendered(
+            event: Optional[Event], updates: List[TrackTemplateResult]
+        ) -> None:
+            result = updates.pop().result
+            if isinstance(result, TemplateError):
+                _LOGGER.error("Error rendering template for %s: %s", self._config_entry.title, result)
+                return
+            self._async_show_rendered(str(result), kwargs)
+
+        self._template_info = async_track_template_result(
+            self.hass,
+            [TrackTemplate(Template(template, self.hass), None, TEMPLATE_RATE_LIMIT)],
+            _async_template_rendered,
+        )
+        self._template_info.async_refresh()
+
+    @callback
+    def _async_stop_template(self) -> None:
+        """Stop showing a template's renders."""
+        if self._template_info is not None:
+            self._template_info.async_remove()
+            self._template_info = None
+            self._row_layout = None
+
+    @callback
+    def _async_show_rendered(self, value: str, kwargs: Dict[str, Any]) -> None:
+        """Queue a template render, fitting only the rows it changed.
+
+        Renders long enough to block the event loop are laid out in full in
+        the executor instead, whatever the overflow mode.
+        """
+        data = self._config_entry.runtime_data
+        self._async_set_state(value)
+        if not value.strip():
+            if data.queue.clear(kwargs.get(ATTR_PRIORITY, 0)):
+                self._layout_generation += 1
+                self.hass.async_create_task(blank_display(self.hass, self._config_entry))
+            return
+        self._layout_generation += 1
+
+        overflow_type = kwargs.get(CONF_OVERFLOW_TYPE, data.settings.overflow_type)
+        if layout_blocks_loop(value, overflow_type, in_full=True):
+            self.hass.async_create_task(self._async_queue_render(value, kwargs))
             return
 
         try:
-            overflow_type = get_config_value(kwargs, self._config_entry, CONF_OVERFLOW_TYPE, DEFAULT_OVERFLOW_TYPE)
-            center_text = get_config_value(kwargs, self._config_entry, CONF_CENTER_TEXT, DEFAULT_CENTER_TEXT)
-            delay = get_config_value(kwargs, self._config_entry, CONF_DELAY_BETWEEN_PAGES, DEFAULT_DELAY_BETWEEN_PAGES)
-            repeat = get_config_value(kwargs, self._config_entry, CONF_REPEAT_MULTIPAGE, DEFAULT_REPEAT_MULTIPAGE)
-            blank_timer = get_config_value(kwargs, self._config_entry, CONF_BLANK_TIMER, DEFAULT_BLANK_TIMER)
+            settings = data.settings
+            center_text = kwargs.get(CONF_CENTER_TEXT, settings.center_text)
+            delay = kwargs.get(CONF_DELAY_BETWEEN_PAGES, settings.delay)
+            repeat = kwargs.get(CONF_REPEAT_MULTIPAGE, settings.repeat)
+
+            start = time.perf_counter()
+            if self._row_layout is None:
+                pages = self._layout(value, kwargs)
+            else:
+                rows = self._row_layout.update(value)
+                pages = tuple(
+                    iter_canvas_pages(rows, settings.num_modules, settings.num_rows, center_text)
+                )
+                _LOGGER.debug(
+                    "Template for %s rendered, fitted %d of %d rows",
+                    self._config_entry.title,
+                    self._row_layout.rows_fitted,
+                    len(rows),
+                )
+            elapsed = time.perf_counter() - start
+            # Only changed rows are fitted again, so renders stay on the event loop.
+            data.stats.record_layout_slice(elapsed)
+            data.stats.record_layout(
+                value,
+                elapsed,
+                len(pages) if isinstance(pages, tuple) else None,
+            )
+            self._async_submit(pages, delay, repeat, kwargs)
+
+        except Exception as e:
+            _LOGGER.error("Error processing template render for display: %s", e, exc_info=True)
+
+    async def _async_queue_render(self, value: str, kwargs: Dict[str, Any]) -> None:
+        """Lay out a long template render in full in the executor and queue it.
 
-            rows = fit_to_rows(value, self._config_entry.data["num_modules"], overflow_type)
-            pages = create_pages(rows, self._config_entry, center_text)
+        A render superseded by a newer message while it is laid out is dropped.
+        """
+        data = self._config_entry.runtime_data
+        generation = self._layout_generation
+        try:
+            delay = kwargs.get(CONF_DELAY_BETWEEN_PAGES, data.settings.delay)
+            repeat = kwargs.get(CONF_REPEAT_MULTIPAGE, data.settings.repeat)
 
-            display_coro = _async_display_pages(self.hass, self._config_entry, pages, delay, repeat, blank_timer)
-            entry_data["display_task"] = asyncio.create_task(display_coro)
+            start = time.perf_counter()
+            pages = await self._async_layout(value, kwargs, in_full=True)
+            if generation != self._layout_generation:
+                _LOGGER.debug("Dropping superseded template render for %s", self._config_entry.title)
+                data.stats.record_superseded()
+                return
+            data.stats.record_layout(
+                value,
+                time.perf_counter() - start,
+                len(pages) if isinstance(pages, tuple) else None,
+            )
+            self._async_submit(pages, delay, repeat, kwargs)
 
         except Exception as e:
-            _LOGGER.error("Error processing text for display: %s", e, exc_info=True)
\ No newline at end of file
+            _LOGGER.error("Error processing template render for display: %s", e, exc_info=True)
+
+    async def _async_queue_value(self, value: str, **kwargs) -> bool:
+        """Lay out value and queue it for display.
+
+        Returns False when value is blank and the display should be blanked;
+        a blank stops only messages of its priority or lower. A value
+        superseded by a newer message while it is laid out is dropped.
+        """
+        self._async_set_state(value)
+
+        data = self._config_entry.runtime_data
+        if not value or not value.strip():
+            if not data.queue.clear(kwargs.get(ATTR_PRIORITY, 0)):
+                return True
+            self._layout_generation += 1
+            return False
+
+        self._layout_generation += 1
+        generation = self._layout_generation
+
+        try:
+            delay = kwargs.get(CONF_DELAY_BETWEEN_PAGES, data.settings.delay)
+            repeat = kwargs.get(CONF_REPEAT_MULTIPAGE, data.settings.repeat)
+
+            start = time.perf_counter()
+            pages = await self._async_layout(value, kwargs)
+            if generation != self._layout_generation:
+                _LOGGER.debug("Dropping superseded message for %s", self._config_entry.title)
+                data.stats.record_superseded()
+                return True
+            data.stats.record_layout(
+                value,
+                time.perf_counter() - start,
+                len(pages) if isinstance(pages, tuple) else None,
+            )
+            self._async_submit(pages, delay, repeat, kwargs)
+
+        except Exception as e:
+            _LOGGER.error("Error processing text for display: %s", e, exc_info=True)
+        return True
+
+    async def _async_show_row(self, row: int, value: str, **kwargs) -> None:
+        """Lay out value on row, counted from 1, leaving the other rows alone.
+
+        A blank value hands the row back to the message on the whole display.
+        Like a message, a row's value is dropped if the row gets a newer one
+        while it is laid out.
+        """
+        data = self._config_entry.runtime_data
+        region = row - 1
+        generation = self._row_generations[region] = self._row_generations.get(region, 0) + 1
+
+        if not value.strip():
+            await data.row_regions.async_release(region)
+            return
+
+        try:
+            settings = data.settings
+            start = time.perf_counter()
+            pages = await self._async_layout(value, kwargs, num_rows=1)
+            if generation != self._row_generations[region]:
+                _LOGGER.debug("Dropping superseded row %d for %s", row, self._config_entry.title)
+                data.stats.record_superseded()
+                return
+            data.stats.record_layout(
+                value,
+                time.perf_counter() - start,
+                len(pages) if isinstance(pages, tuple) else None,
+            )
+            ttl = kwargs.get(ATTR_TTL)
+            data.row_regions.show(
+                region,
+                pages,
+                kwargs.get(CONF_DELAY_BETWEEN_PAGES, settings.delay),
+                kwargs.get(CONF_REPEAT_MULTIPAGE, settings.repeat),
+                kwargs.get(CONF_BLANK_TIMER, settings.blank_timer),
+                self.hass.loop.time() + ttl if ttl is not None else None,
+            )
+
+        except Exception as e:
+            _LOGGER.error("Error processing row text for display: %s", e, exc_info=True)
+
+    async def _async_queue_playlist(self, messages: List[Dict[str, Any]], **kwargs) -> None:
+        """Lay out every message of a playlist up front and queue them as one message.
+
+        Items fall back to the playlist's options and then the entry's, except
+        repeat, which repeats the whole playlist; an item is shown once unless
+        it sets its own. Like a single message, the playlist is dropped if a
+        newer message arrives while it is laid out.
+        """
+        self._async_set_state(messages[0][ATTR_TEXT])
+        self._layout_generation += 1
+        generation = self._layout_generation
+
+        try:
+            data = self._config_entry.runtime_data
+            start = time.perf_counter()
+            items = []
+            for message in messages:
+                overrides = {**kwargs, **message}
+                overrides.pop(CONF_REPEAT_MULTIPAGE, None)
+                pages = await self._async_layout(overrides.pop(ATTR_TEXT), overrides)
+                if generation != self._layout_generation:
+                    _LOGGER.debug("Dropping superseded playlist for %s", self._config_entry.title)
+                    data.stats.record_superseded()
+                    return
+                delay = overrides.get(CONF_DELAY_BETWEEN_PAGES, data.settings.delay)
+                items.append((pages, delay, message.get(CONF_REPEAT_MULTIPAGE, 0)))
+            page_counts = [len(pages) for pages, _, _ in items if isinstance(pages, tuple)]
+            data.stats.record_layout(
+                " / ".join(message[ATTR_TEXT] for message in messages),
+                time.perf_counter() - start,
+                sum(page_counts) if len(page_counts) == len(items) else None,
+            )
+
+            repeat = kwargs.get(CONF_REPEAT_MULTIPAGE, data.settings.repeat)
+            self._async_submit(Playlist(items), None, repeat, kwargs)
+
+        except Exception as e:
+            _LOGGER.error("Error processing playlist for display: %s", e, exc_info=True)
+
+    def _layout(self, value: str, overrides: Dict[str, Any]) -> Iterable[str]:
+        """Lay out value with the overflow and centering options in effect."""
+        data = self._config_entry.runtime_data
+        settings = data.settings
+        return layout_pages(
+            value,
+            settings,
+            overrides.get(CONF_OVERFLOW_TYPE, settings.overflow_type),
+            overrides.get(CONF_CENTER_TEXT, settings.center_text),
+            data.layout_cache,
+        )
+
+    async def _async_layout(
+        self,
+        value: str,
+        overrides: Dict[str, Any],
+        num_rows: Optional[int] = None,
+        in_full: bool = False,
+    ) -> Iterable[str]:
+        """Lay out value like _layout, off the event loop when it is long."""
+        data = self._config_entry.runtime_data
+        settings = data.settings
+        return await async_layout_pages(
+            self.hass,
+            value,
+            settings,
+            overrides.get(CONF_OVERFLOW_TYPE, settings.overflow_type),
+            overrides.get(CONF_CENTER_TEXT, settings.center_text),
+            data.layout_cache,
+            data.stats,
+            num_rows,
+            in_full,
+        )
+
+    @callback
+    def _async_submit(
+        self, pages: Iterable[str], delay: Optional[int], repeat: int, kwargs: Dict[str, Any]
+    ) -> None:
+        """Queue laid out pages with the message-level options in kwargs."""
+        data = self._config_entry.runtime_data
+        blank_timer = kwargs.get(CONF_BLANK_TIMER, data.settings.blank_timer)
+        ttl = kwargs.get(ATTR_TTL)
+        data.queue.submit(
+            QueuedMessage(
+                pages,
+                delay,
+                repeat,
+                blank_timer,
+                priority=kwargs.get(ATTR_PRIORITY, 0),
+                expires_at=self.hass.loop.time() + ttl if ttl is not None else None,
+                coalesce_key=kwargs.get(ATTR_COALESCE_KEY),
+            )
+        )
@@ -1,15 +1,27 @@
 """Text processing functions for the Splitflap integration."""
-from dataclasses import dataclass, field
-from typing import List
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-@dataclass
+from .charset import FlapTranslationTable, get_translation_table
+
+_ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+_TOKEN_RE = re.compile(r" +|[^ ]+")
+_CHUNK_SIZE = 1024
+
+@dataclass(slots=True)
 class Row:
-    """Represents a single row of processed text for the display."""
+    """Represents a single row of processed text for the display.
+
+    word_length is the total length of the complete words in the row, which
+    is all centering needs to know about them.
+    """
     content: str
     is_continuation: bool = False
     splits_word: bool = False
     has_triple_spaces: bool = False
-    complete_words: List[str] = field(default_factory=list)
+    word_length: int = 0
 
     def can_be_centered(self) -> bool:
         """Determine if a row's content is suitable for centering."""
@@ -17,122 +29,418 @@ class Row:
             return False
         if self.has_triple_spaces or self.splits_word or self.is_continuation:
             return False
-        content_length = sum(len(word) for word in self.complete_words)
-        return (content_length / len(self.content)) <= 0.6 if self.content else False
+        return (self.word_length / len(self.content)) <= 0.6 if self.content else False
+
+def process_escaped_chars(text: str, table: Optional[FlapTranslationTable] = None) -> str:
+    """Process escaped characters for lowercase and uppercase the rest.
 
-def process_escaped_chars(text: str) -> str:
-    """Process escaped characters for lowercase and uppercase the rest."""
+    With a translation table the uppercased text is also mapped onto the
+    flaps; escaped characters, such as color codes, are passed through.
+    """
     result = []
-    i = 0
-    while i < len(text):
-        if text[i] == "\\" and i + 1 < len(text):
-            result.append(text[i + 1].lower())
-            i += 2
-        else:
-            result.append(text[i].upper())
-            i += 1
+    last = 0
+    for match in _ESCAPE_RE.finditer(text):
+        result.append(_translate(text[last:match.start()].upper(), table))
+        result.append(match.group(1).lower())
+        last = match.end()
+    result.append(_translate(text[last:].upper(), table))
     return "".join(result)
 
+def _translate(text: str, table: Optional[FlapTranslationTable]) -> str:
+    return text.translate(table) if table is not None else text
+
+def iter_processed_chunks(text: str, alphabet: str = "") -> Iterator[str]:
+    """Lazily yield process_escaped_chars(text) in chunks of bounded size.
+
+    With a flap alphabet, the unescaped text of each chunk is also mapped
+    onto the flaps the display has.
+    """
+    table = get_translation_table(alphabet)
+    start = 0
+    length = len(text)
+    while start < length:
+        end = min(start + _CHUNK_SIZE, length)
+        block = text[start:end]
+        # An odd run of trailing backslashes escapes the first character of the next block.
+        if end < length and (len(block) - len(block.rstrip("\\"))) % 2:
+            end += 1
+            block = text[start:end]
+        yield process_escaped_chars(block, table)
+        start = end
+
 def split_into_tokens(text: str) -> List[str]:
     """Split text into words and spaces as separate tokens, preserving spacing."""
-    tokens = []
-    current_word = ""
-    i = 0
-    while i < len(text):
-        if text[i] == ' ':
-            if current_word:
-                tokens.append(current_word)
-                current_word = ""
-            space_start = i
-            while i < len(text) and text[i] == ' ':
-                i += 1
-            tokens.append(text[space_start:i])
-        else:
-            current_word += text[i]
-            i += 1
-    if current_word:
-        tokens.append(current_word)
-    return tokens
+    return _TOKEN_RE.findall(text)
 
-def fit_to_rows(text: str, row_length: int, mode: str) -> List[Row]:
+def iter_tokens(chunks: Iterable[str]) -> Iterator[str]:
+    """Lazily yield the tokens split_into_tokens would return for the joined chunks."""
+    pending: List[str] = []
+    for chunk in chunks:
+        tokens = _TOKEN_RE.findall(chunk)
+        if not tokens:
+            continue
+        # The last token of a chunk may continue into the next one, so it is held back.
+        first = 0
+        if pending:
+            if (tokens[0][0] == " ") == (pending[0][0] == " "):
+                pending.append(tokens[0])
+                if len(tokens) == 1:
+                    continue
+                first = 1
+            yield "".join(pending)
+        yield from tokens[first:-1]
+        pending = [tokens[-1]]
+    if pending:
+        yield "".join(pending)
+
+def fit_to_rows(text: str, row_length: int, mode: str, alphabet: str = "") -> List[Row]:
     """Master function to fit text to rows based on selected mode."""
-    processed_text = process_escaped_chars(text)
-    tokens = split_into_tokens(processed_text)
+    return list(iter_rows(text, row_length, mode, alphabet))
+
+def iter_rows(text: str, row_length: int, mode: str, alphabet: str = "") -> Iterator[Row]:
+    """Lazily fit text to rows, holding only the row being built.
 
+    Escapes such as the "\\w" color codes become a single character before
+    fitting, so each takes one module of row width.
+    """
+    return _fit_chunks(iter_processed_chunks(text, alphabet), row_length, mode)
+
+def _fit_chunks(
+    chunks: Iterable[str], row_length: int, mode: str, is_continuation: bool = False
+) -> Iterator[Row]:
+    """Lazily fit already processed text to rows.
+
+    Raises ValueError for a mode that fits rows some other way or not at
+    all, such as scroll.
+    """
     if mode == "none":
-        return _fit_to_rows_nooverflow(processed_text, row_length)
+        return _fit_to_rows_nooverflow(chunks, row_length, is_continuation)
+    tokens = iter_tokens(chunks)
     if mode == "hyphen":
         return _fit_to_rows_hyphen(tokens, row_length)
-    return _fit_to_rows_newline(tokens, row_length)
+    if mode == "optimal":
+        return _fit_to_rows_optimal(tokens, row_length)
+    if mode == "new line":
+        return _fit_to_rows_newline(tokens, row_length)
+    raise ValueError(f"Unknown overflow mode: {mode!r}")
 
-def _fit_to_rows_newline(tokens: List[str], row_length: int) -> List[Row]:
+def _fit_to_rows_newline(tokens: Iterable[str], row_length: int) -> Iterator[Row]:
     """Fit text to rows, moving whole words to a new line if they don't fit."""
-    rows = []
-    current_row = ""
-    current_words = []
+    parts: List[str] = []
+    word_length = 0
+    length = 0
     for token in tokens:
-        if len(current_row) + len(token) <= row_length:
-            current_row += token
+        token_length = len(token)
+        if length + token_length <= row_length:
+            parts.append(token)
+            length += token_length
             if not token.isspace():
-                current_words.append(token)
-        else:
-            rows.append(Row(content=current_row, complete_words=current_words, has_triple_spaces="   " in current_row))
-            if token.isspace():
-                current_row = ""
-                current_words = []
-            else:
-                if len(token) > row_length:
-                    while len(token) > row_length:
-                        rows.append(Row(content=token[:row_length], splits_word=True))
-                        token = token[row_length:]
-                    current_row = token
-                    current_words = [token] if token else []
-                else:
-                    current_row = token
-                    current_words = [token]
-
-    if current_row:
-        rows.append(Row(content=current_row, complete_words=current_words, has_triple_spaces="   " in current_row))
+                word_length += token_length
+            continue
+
+        content = "".join(parts)
+        yield Row(content=content, word_length=word_length, has_triple_spaces="   " in content)
+        parts, word_length, length = [], 0, 0
+        if token.isspace():
+            continue
+
+        # Words longer than a row are cut into full-width chunks; the remainder starts the next row.
+        start = 0
+        while token_length - start > row_length:
+            yield Row(content=token[start:start + row_length], splits_word=True)
+            start += row_length
+        remainder = token[start:] if start else token
+        if remainder:
+            parts.append(remainder)
+            length = word_length = len(remainder)
+
+    content = "".join(parts)
+    if content:
+        yield Row(content=content, word_length=word_length, has_triple_spaces="   " in content)
+
+def _fit_to_rows_optimal(tokens: Iterable[str], row_length: int) -> Iterator[Row]:
+    """Fit text to the fewest rows, choosing breaks that give the least ragged edge.
+
+    Breaks are chosen per paragraph, so unlike the other modes a paragraph is
+    buffered before its first row is yielded.
+    """
+    words: List[str] = []
+    gaps: List[str] = []
+    gap: List[str] = []
+    for token in tokens:
+        if token.isspace():
+            gap.append(token)
+            continue
+        if len(token) <= row_length:
+            words.append(token)
+            gaps.append("".join(gap))
+            gap = []
+            continue
+
+        # Words longer than a row end the paragraph, fill whole rows like the
+        # "new line" mode, and their remainder must start the next row.
+        yield from _break_paragraph(words, gaps, row_length)
+        words, gaps, gap = [], [], []
+        start = 0
+        while len(token) - start > row_length:
+            yield Row(content=token[start:start + row_length], splits_word=True)
+            start += row_length
+        remainder = token[start:]
+        if remainder:
+            words.append(remainder)
+            gaps.append("")
+
+    yield from _break_paragraph(words, gaps, row_length)
+
+def _break_paragraph(words: List[str], gaps: List[str], row_length: int) -> List[Row]:
+    """Break words into rows minimizing the row count, then the squared slack.
+
+    gaps[k] is the spacing before words[k]; spacing at a row break is dropped,
+    except the leading spacing of the paragraph when it fits. Every word must
+    fit on a row. Only breaks within one row's width are considered, so the
+    cost is O(len(words) * row_length).
+    """
+    count = len(words)
+    if not count:
+        return []
+    if len(gaps[0]) + len(words[0]) > row_length:
+        gaps[0] = ""
+
+    text = "".join(gap + word for gap, word in zip(gaps, words))
+    starts = []
+    ends = []
+    offset = 0
+    for gap, word in zip(gaps, words):
+        offset += len(gap)
+        starts.append(offset)
+        offset += len(word)
+        ends.append(offset)
+    starts[0] = 0
+
+    no_layout = (count + 1, 0)
+    best = [(0, 0)] + [no_layout] * count
+    previous = [0] * (count + 1)
+    for end in range(1, count + 1):
+        is_last = end == count
+        line_end = ends[end - 1]
+        for begin in range(end - 1, -1, -1):
+            slack = row_length - (line_end - starts[begin])
+            if slack < 0:
+                break
+            lines, raggedness = best[begin]
+            candidate = (lines + 1, raggedness if is_last else raggedness + slack * slack)
+            if candidate < best[end]:
+                best[end] = candidate
+                previous[end] = begin
+
+    breaks = []
+    end = count
+    while end:
+        breaks.append((previous[end], end))
+        end = previous[end]
+
+    rows = []
+    for begin, end in reversed(breaks):
+        content = text[starts[begin]:ends[end - 1]]
+        word_length = sum(map(len, words[begin:end]))
+        rows.append(
+            Row(content=content, word_length=word_length, has_triple_spaces="   " in content)
+        )
     return rows
 
-def _fit_to_rows_hyphen(tokens: List[str], row_length: int) -> List[Row]:
+def _fit_to_rows_hyphen(tokens: Iterable[str], row_length: int) -> Iterator[Row]:
     """Fit text to rows, breaking words with a hyphen if they don't fit."""
-    rows = []
-    current_row = ""
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
+    parts: List[str] = []
+    length = 0
+    continuation = False
+    # A one-module row has no room for a hyphen, so words are cut without one.
+    split_point = row_length - 1 if row_length > 1 else row_length
+    hyphen = "-" if row_length > 1 else ""
+
+    for token in tokens:
+        token_length = len(token)
+        if length + token_length <= row_length:
+            parts.append(token)
+            length += token_length
+            continue
+
         if token.isspace():
-            if len(current_row) + len(token) <= row_length:
-                current_row += token
-                i += 1
-            else:
-                rows.append(Row(content=current_row))
-                current_row = ""
-        elif len(current_row) + len(token) <= row_length:
-            current_row += token
-            i += 1
+            # Spaces that overflow end the row and are kept as leading spaces of the next
+            # row when they fit there; a run wider than a whole row is dropped.
+            if parts:
+                yield Row(content="".join(parts), is_continuation=continuation)
+                continuation = False
+                parts, length = [], 0
+                if token_length <= row_length:
+                    parts.append(token)
+                    length = token_length
+            continue
+
+        if parts:
+            yield Row(content="".join(parts), is_continuation=continuation)
+            continuation = False
+            parts, length = [], 0
+
+        start = 0
+        while token_length - start > row_length:
+            yield Row(
+                content=token[start:start + split_point] + hyphen,
+                is_continuation=continuation,
+                splits_word=True,
+            )
+            continuation = True
+            start += split_point
+        remainder = token[start:] if start else token
+        parts.append(remainder)
+        length = len(remainder)
+
+    if parts:
+        yield Row(content="".join(parts), is_continuation=continuation)
+
+def _fit_to_rows_nooverflow(
+    chunks: Iterable[str], row_length: int, is_continuation: bool = False
+) -> Iterator[Row]:
+    """Fit text to rows by simply cutting at the row length.
+
+    is_continuation is True when chunks continue text already fitted.
+    """
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        if len(pending) < row_length:
+            continue
+        full = len(pending) - len(pending) % row_length
+        for i in range(0, full, row_length):
+            yield Row(content=pending[i:i + row_length], is_continuation=is_continuation, splits_word=True)
+            is_continuation = True
+        pending = pending[full:]
+    if pending:
+        yield Row(content=pending, is_continuation=is_continuation, splits_word=True)
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Return the length of the longest common prefix of a and b."""
+    # Comparing halves of slices keeps the character loop in C.
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
         else:
-            if not current_row:
-                split_point = row_length - 1
-                rows.append(Row(content=token[:split_point] + "-", splits_word=True))
-                tokens[i] = token[split_point:]
-            else:
-                rows.append(Row(content=current_row))
-                current_row = ""
-    if current_row:
-        rows.append(Row(content=current_row))
-    for i in range(1, len(rows)):
-        if rows[i - 1].splits_word:
-            rows[i].is_continuation = True
-    return rows
+            high = middle - 1
+    return low
 
-def _fit_to_rows_nooverflow(text: str, row_length: int) -> List[Row]:
-    """Fit text to rows by simply cutting at the row length."""
-    rows = []
-    for i in range(0, len(text), row_length):
-        rows.append(Row(content=text[i:i + row_length], splits_word=True))
-    for i in range(1, len(rows)):
-        if rows[i-1].splits_word:
-            rows[i].is_continuation = True
-    return rows
\ No newline at end of file
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Return the length of the longest common suffix of a and b, at most limit."""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:len(a) - low] == b[len(b) - middle:len(b) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+class RowLayout:
+    """The rows of a text, kept to fit a changed version of it incrementally.
+
+    In the "new line" and "none" modes a row only depends on the text from
+    where it starts, so a changed text is fitted again from the row before
+    the first change, and the old rows are reused as soon as the new ones
+    line up with them over the unchanged end of the text. The other modes
+    carry state across rows and are fitted again in full.
+    """
+
+    def __init__(self, row_length: int, mode: str, alphabet: str = "") -> None:
+        """Initialize an empty layout."""
+        self.row_length = row_length
+        self.mode = mode
+        self.alphabet = alphabet
+        self.rows: List[Row] = []
+        self.rows_fitted = 0
+        self._text: Optional[str] = None
+        self._starts: List[int] = []
+
+    def update(self, text: str) -> List[Row]:
+        """Fit text to rows, reusing the rows of the previous text where possible."""
+        processed = "".join(iter_processed_chunks(text, self.alphabet))
+        old = self._text
+        self._text = processed
+        if processed == old:
+            self.rows_fitted = 0
+            return self.rows
+        if self.mode not in ("new line", "none"):
+            self.rows = list(_fit_chunks([processed], self.row_length, self.mode))
+            self.rows_fitted = len(self.rows)
+            return self.rows
+        if old is None:
+            fitted = list(self._iter_fit(processed, 0))
+            self.rows = [row for row, _ in fitted]
+            self._starts = [start for _, start in fitted]
+            self.rows_fitted = len(fitted)
+            return self.rows
+
+        prefix = _common_prefix_length(old, processed)
+        suffix = _common_suffix_length(old, processed, min(len(old), len(processed)) - prefix)
+
+        first = self._restart_row(prefix)
+        rows = self.rows[:first]
+        starts = self._starts[:first]
+        shift = len(processed) - len(old)
+        self.rows_fitted = 0
+        for row, start in self._iter_fit(processed, self._starts[first] if self._starts else 0):
+            if self.rows_fitted and start >= len(processed) - suffix:
+                index = bisect_left(self._starts, start - shift)
+                if (
+                    0 < index < len(self._starts)
+                    and self._starts[index] == start - shift
+                    and self._starts_fresh(row, rows[-1])
+                    and self._starts_fresh(self.rows[index], self.rows[index - 1])
+                ):
+                    rows += self.rows[index:]
+                    starts += [old_start + shift for old_start in self._starts[index:]]
+                    break
+            rows.append(row)
+            starts.append(start)
+            self.rows_fitted += 1
+        self.rows = rows
+        self._starts = starts
+        return rows
+
+    def _restart_row(self, position: int) -> int:
+        """Return the row to fit again from for a change at position."""
+        index = bisect_right(self._starts, position) - 1
+        while index > 0:
+            row = self.rows[index]
+            # In the word modes the row before breaks on the first word of this
+            # one, so that word and the character after it must be unchanged.
+            if self.mode == "none" or self._starts[index] + len(row.content) < position:
+                if self._starts_fresh(row, self.rows[index - 1]):
+                    return index
+            index -= 1
+        return 0
+
+    def _starts_fresh(self, row: Row, previous: Optional[Row]) -> bool:
+        """Return whether fitting from where row starts gives row and those after it."""
+        if self.mode == "none" or previous is None:
+            return True
+        # A row cut from a long word, or the row after one, starts mid-word.
+        return bool(row.content) and not row.splits_word and not previous.splits_word
+
+    def _iter_fit(self, processed: str, start: int) -> Iterator[Tuple[Row, int]]:
+        """Lazily fit processed text from start, yielding each row with where it starts."""
+        # Small chunks, so fitting that stops early only tokenizes what it used.
+        size = max(self.row_length * 4, 64)
+        chunks = (processed[index:index + size] for index in range(start, len(processed), size))
+        rows = _fit_chunks(chunks, self.row_length, self.mode, start > 0)
+        if self.mode == "none":
+            for index, row in enumerate(rows):
+                yield row, start + index * self.row_length
+            return
+
+        # Only spaces are dropped between rows, so each row is found where the last one ended.
+        position = start
+        for row in rows:
+            if row.content:
+                position = processed.find(row.content, position)
+            yield row, position
+            position += len(row.content)